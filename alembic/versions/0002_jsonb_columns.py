@@ -0,0 +1,53 @@
+"""Store JSON columns as JSONB on Postgres and index webhook payloads."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0002_jsonb_columns"
+down_revision = "0001_initial"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+JSON_COLUMNS = (
+    ("tokens", "scopes"),
+    ("tokens", "raw_metadata"),
+    ("webhook_events", "payload"),
+    ("jobs", "payload"),
+    ("calendar_notes", "related_ids"),
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            postgresql_using=f"{column}::jsonb",
+        )
+    op.create_index(
+        "ix_webhook_events_payload_gin",
+        "webhook_events",
+        ["payload"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index("ix_webhook_events_payload_gin", table_name="webhook_events")
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            postgresql_using=f"{column}::json",
+        )
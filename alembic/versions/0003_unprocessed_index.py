@@ -0,0 +1,25 @@
+"""Partial index over unprocessed webhook events in delivery order."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_unprocessed_index"
+down_revision = "0002_jsonb_columns"
+branch_labels: tuple[str, ...] | None = None
+depends_on: tuple[str, ...] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_webhook_events_unprocessed",
+        "webhook_events",
+        ["delivered_at"],
+        sqlite_where=sa.text("processed_at IS NULL"),
+        postgresql_where=sa.text("processed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_events_unprocessed", table_name="webhook_events")
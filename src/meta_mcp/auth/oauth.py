@@ -20,8 +20,11 @@ def generate_state(length: int = 32) -> str:
 class MetaOAuthClient:
     """Handle Meta OAuth login flows."""
 
-    def __init__(self, settings: MetaMcpSettings) -> None:
+    def __init__(
+        self, settings: MetaMcpSettings, *, transport: httpx.AsyncBaseTransport | None = None
+    ) -> None:
         self._settings = settings
+        self._transport = transport
 
     def build_authorization_url(
         self,
@@ -55,7 +58,9 @@ class MetaOAuthClient:
             "redirect_uri": redirect_uri,
             "code": code,
         }
-        async with httpx.AsyncClient(timeout=self._settings.default_timeout_seconds) as client:
+        async with httpx.AsyncClient(
+            timeout=self._settings.default_timeout_seconds, transport=self._transport
+        ) as client:
             response = await client.get(
                 f"{self._settings.graph_api_base_url}/{self._settings.graph_api_version}/oauth/access_token",
                 params=params,
@@ -43,15 +43,47 @@ class MetaMcpSettings(BaseSettings):
     )
     default_timeout_seconds: float = Field(default=30.0, ge=1.0, description="HTTP request timeout")
     max_retries: int = Field(default=5, ge=0, le=10, description="Maximum HTTP retry attempts")
+    http2: bool = Field(
+        default=False, description="Multiplex Graph requests over HTTP/2 (requires h2)"
+    )
     retry_backoff_factor: float = Field(default=0.5, description="Base backoff factor in seconds")
     retry_backoff_max: float = Field(default=30.0, description="Maximum backoff in seconds")
+    retry_after_max_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="Longest server-requested Retry-After wait honoured before retrying",
+    )
     database_url: str = Field(
         default="sqlite+aiosqlite:///./meta_mcp.db",
         description="SQLAlchemy database URL",
     )
+    db_pool_size: int = Field(
+        default=20, ge=1, description="Persistent database connections per process"
+    )
+    db_max_overflow: int = Field(
+        default=10, ge=0, description="Extra connections allowed during bursts"
+    )
+    db_pool_timeout_seconds: float = Field(
+        default=30.0, gt=0, description="Wait for a pooled connection"
+    )
+    db_pool_recycle_seconds: int = Field(
+        default=1800, ge=-1, description="Recycle connections older than this"
+    )
     cache_maxsize: int = Field(default=256, ge=0, description="Maximum entries for in-memory caches")
+    cache_ttl_seconds: float = Field(
+        default=300.0, gt=0, description="Lifetime of cached Graph responses"
+    )
     rate_limit_per_app: int = Field(default=90, ge=1, description="Requests per minute allowance")
     rate_limit_per_token: int = Field(default=30, ge=1, description="Per-token requests per minute")
+    batch_window_seconds: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description=(
+            "Coalesce concurrent GETs per token into Graph batch calls within this window "
+            "(0 disables)"
+        ),
+    )
     webhook_queue_workers: int = Field(default=2, ge=1, description="Webhook worker concurrency")
     enable_request_logging: bool = Field(default=False, description="Emit request/response logs")
     pii_redaction_keys: Sequence[str] = Field(
@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 import hashlib
-import json
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Mapping, Sequence
+from typing import Any, Hashable, Mapping, Sequence
 
 from mcp.server.fastmcp import Context
 
+from .. import serialization
 from ..auth import MetaOAuthClient, generate_state
 from ..config import MetaMcpSettings
 from ..errors import MCPException, McpError, McpErrorCode, error_response
@@ -64,15 +64,15 @@ def datetime_to_timestamp(value: datetime | None) -> int | None:
 
 
 def compute_idempotency_key(*, method: str, path: str, payload: Mapping[str, Any] | None) -> str:
-    raw = json.dumps(
+    raw = serialization.dumps(
         {
             "method": method,
             "path": path,
-            "payload": payload or {},
+            "payload": dict(payload or {}),
         },
         sort_keys=True,
     )
-    return hashlib.sha256(raw.encode()).hexdigest()
+    return hashlib.sha256(raw).hexdigest()
 
 
 def resolve_access_token(ctx: Context, *, provided: str | None = None, settings: MetaMcpSettings | None = None) -> str:
@@ -120,7 +120,6 @@ async def ensure_scopes(
     token_hint: TokenType | None = None,
     provided_token: str | None = None,
 ) -> tuple[str, TokenMetadata]:
-    import traceback
     access_token: str | None = None
     
     # First, try to resolve from request context or env
@@ -132,8 +131,8 @@ async def ensure_scopes(
             access_token = await env.token_service.get_session_token_for_scopes(
                 required_scopes=list(required_scopes)
             )
-        except Exception as e:
-            logger.error("error_getting_session_token", error=str(e), traceback=traceback.format_exc())
+        except Exception:
+            logger.exception("error_getting_session_token")
             raise
     
     if not access_token:
@@ -181,6 +180,7 @@ async def perform_graph_call(
     require_ppca: bool = False,
     token_hint: TokenType | None = None,
     use_cache: bool = False,
+    cache_key: Hashable | None = None,
     idempotency: bool = False,
     provided_token: str | None = None,
 ) -> Mapping[str, Any]:
@@ -200,7 +200,7 @@ async def perform_graph_call(
     if idempotency:
         idempotency_key = compute_idempotency_key(method=method, path=path, payload=body or {})
 
-    response = await env.client.request(
+    response, data = await env.client.request_with_json(
         access_token=access_token,
         method=method,
         path=path,
@@ -210,28 +210,89 @@ async def perform_graph_call(
         files=files,
         idempotency_key=idempotency_key,
         use_cache=use_cache,
+        cache_key=cache_key,
     )
 
     response_meta = extract_meta(response.headers)
     response_meta["token_subject_id"] = metadata.subject_id
     response_meta["token_type"] = metadata.type.value
 
+    if data is None:
+        # Not JSON (or a literal ``null``): fall back to the raw text.
+        try:
+            data = response.json()
+        except ValueError:
+            data = response.content.decode(errors='ignore')
     payload = {
         "status": response.status_code,
         "headers": dict(response.headers),
+        "data": data,
     }
-    try:
-        payload['data'] = response.json()
-    except ValueError:
-        payload['data'] = response.content.decode(errors='ignore')
     return success(payload, meta=response_meta)
 
 
+async def perform_paginated_graph_call(
+    *,
+    env: ToolEnvironment,
+    ctx: Context[Any, Any, Any],
+    path: str,
+    query: dict[str, Any] | None,
+    max_pages: int,
+    required_scopes: Sequence[str],
+    require_ppca: bool = False,
+    token_hint: TokenType | None = None,
+    use_cache: bool = False,
+) -> Mapping[str, Any]:
+    """Follow ``paging.cursors.after`` for up to ``max_pages`` GET requests (at least one).
+
+    Cursor pages are inherently sequential (each cursor comes from the previous
+    response), so pages are fetched one after another and their ``data`` arrays
+    concatenated into a single result shaped like :func:`perform_graph_call`.
+    Query values must be hashable scalars: the response cache is keyed on a
+    ``(path, query items)`` tuple instead of a canonicalised JSON digest.
+    """
+
+    params = dict(query or {})
+    items: list[Any] = []
+    pages = 0
+    while True:
+        result = await perform_graph_call(
+            env=env,
+            ctx=ctx,
+            method="GET",
+            path=path,
+            query=params,
+            body=None,
+            required_scopes=required_scopes,
+            require_ppca=require_ppca,
+            token_hint=token_hint,
+            use_cache=use_cache,
+            cache_key=(path, tuple(params.items())) if use_cache else None,
+        )
+        pages += 1
+        page = result["data"]["data"]
+        if not isinstance(page, Mapping):
+            return result
+        page_items = page.get("data") or []
+        items.extend(page_items)
+        cursors = (page.get("paging") or {}).get("cursors") or {}
+        if not page_items or "after" not in cursors or pages >= max_pages:
+            break
+        params["after"] = cursors["after"]
+
+    if pages == 1:
+        return result
+    payload = dict(result["data"])
+    payload["data"] = {"data": items, "paging": page.get("paging") or {}}
+    return success(payload, meta={**result["meta"], "pages": pages})
+
+
 __all__ = [
     "ToolEnvironment",
     "success",
     "failure",
     "perform_graph_call",
+    "perform_paginated_graph_call",
     "ensure_scopes",
     "resolve_access_token",
     "extract_meta",
@@ -55,7 +55,7 @@ def register(server: FastMCP, env: ToolEnvironment) -> None:
             response = PermissionsCheckResponse(
                 app_id=metadata.app_id,
                 type=metadata.type.value,
-                scopes=metadata.scopes,
+                scopes=list(metadata.scopes),
                 expires_at=metadata.expires_at,
                 valid=not metadata.is_expired,
             )
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import traceback
+from functools import partial
 from typing import Mapping
 
 from mcp.server.fastmcp import Context, FastMCP
@@ -19,7 +19,15 @@ from ..meta_client import (
     ResearchPublicPagesPostsList,
 )
 from ..storage import TokenType
-from .common import ToolEnvironment, datetime_to_timestamp, failure, perform_graph_call
+from .common import (
+    ToolEnvironment,
+    datetime_to_timestamp,
+    failure,
+    perform_graph_call,
+    perform_paginated_graph_call,
+)
+
+logger = get_logger(__name__)
 
 PAGE_RESEARCH_SCOPES = (
     "pages_read_engagement",
@@ -48,6 +56,28 @@ def register(server: FastMCP, env: ToolEnvironment) -> None:
     """Register research tools."""
 
     version = env.settings.graph_api_version
+    page_research_get = partial(
+        perform_paginated_graph_call,
+        env=env,
+        required_scopes=PAGE_RESEARCH_SCOPES,
+        require_ppca=True,
+        token_hint=TokenType.PAGE,
+        use_cache=True,
+    )
+    ig_research_get = partial(
+        perform_paginated_graph_call,
+        env=env,
+        required_scopes=IG_RESEARCH_SCOPES,
+        token_hint=TokenType.INSTAGRAM,
+        use_cache=True,
+    )
+    ad_library_get = partial(
+        perform_paginated_graph_call,
+        env=env,
+        required_scopes=ADS_LIBRARY_SCOPES,
+        token_hint=TokenType.AD_ACCOUNT,
+        use_cache=True,
+    )
 
     @server.tool(name="research.public_pages.posts.list", structured_output=True, description="List public posts from a specific Facebook Page.")
     async def public_pages_posts(args: ResearchPublicPagesPostsList, ctx: Context) -> Mapping[str, object]:
@@ -58,17 +88,11 @@ def register(server: FastMCP, env: ToolEnvironment) -> None:
                 "after": args.after,
                 "limit": args.limit,
             }
-            return await perform_graph_call(
-                env=env,
+            return await page_research_get(
                 ctx=ctx,
-                method="GET",
                 path=f"/{version}/{args.page_id}/posts",
                 query=query,
-                body=None,
-                required_scopes=PAGE_RESEARCH_SCOPES,
-                require_ppca=True,
-                token_hint=TokenType.PAGE,
-                use_cache=True,
+                max_pages=args.max_pages,
             )
         except MCPException as exc:
             return failure(exc.error)
@@ -80,17 +104,11 @@ def register(server: FastMCP, env: ToolEnvironment) -> None:
                 "after": args.after,
                 "limit": args.limit,
             }
-            return await perform_graph_call(
-                env=env,
+            return await page_research_get(
                 ctx=ctx,
-                method="GET",
                 path=f"/{version}/{args.post_id}/comments",
                 query=query,
-                body=None,
-                required_scopes=PAGE_RESEARCH_SCOPES,
-                require_ppca=True,
-                token_hint=TokenType.PAGE,
-                use_cache=True,
+                max_pages=args.max_pages,
             )
         except MCPException as exc:
             return failure(exc.error)
@@ -102,16 +120,11 @@ def register(server: FastMCP, env: ToolEnvironment) -> None:
                 "after": args.after,
                 "limit": args.limit,
             }
-            return await perform_graph_call(
-                env=env,
+            return await ig_research_get(
                 ctx=ctx,
-                method="GET",
                 path=f"/{version}/{args.ig_user_id}/media",
                 query=query,
-                body=None,
-                required_scopes=IG_RESEARCH_SCOPES,
-                token_hint=TokenType.INSTAGRAM,
-                use_cache=True,
+                max_pages=args.max_pages,
             )
         except MCPException as exc:
             return failure(exc.error)
@@ -123,16 +136,11 @@ def register(server: FastMCP, env: ToolEnvironment) -> None:
                 "after": args.after,
                 "limit": args.limit,
             }
-            return await perform_graph_call(
-                env=env,
+            return await ig_research_get(
                 ctx=ctx,
-                method="GET",
                 path=f"/{version}/{args.ig_media_id}/comments",
                 query=query,
-                body=None,
-                required_scopes=IG_RESEARCH_SCOPES,
-                token_hint=TokenType.INSTAGRAM,
-                use_cache=True,
+                max_pages=args.max_pages,
             )
         except MCPException as exc:
             return failure(exc.error)
@@ -155,6 +163,7 @@ def register(server: FastMCP, env: ToolEnvironment) -> None:
                 require_ppca=True,
                 token_hint=TokenType.PAGE,
                 use_cache=True,
+                cache_key=(path, tuple(query.items())),
             )
         except MCPException as exc:
             return failure(exc.error)
@@ -172,22 +181,16 @@ def register(server: FastMCP, env: ToolEnvironment) -> None:
                 "after": args.after,
             }
             path = f"/{version}/ads_archive"
-            return await perform_graph_call(
-                env=env,
+            return await ad_library_get(
                 ctx=ctx,
-                method="GET",
                 path=path,
                 query=query,
-                body=None,
-                required_scopes=ADS_LIBRARY_SCOPES,
-                token_hint=TokenType.AD_ACCOUNT,
-                use_cache=True,
+                max_pages=args.max_pages,
             )
         except MCPException as exc:
             return failure(exc.error)
-        except Exception as e:
-            logger = get_logger(__name__)
-            logger.error("unhandled_error_in_ad_search", error=str(e), traceback=traceback.format_exc())
+        except Exception:
+            logger.exception("unhandled_error_in_ad_search")
             return failure(McpError(code=McpErrorCode.INTERNAL, message="Internal server error"))
 
     @server.tool(name="research.ad_library.by_page", structured_output=True, description="Search the Meta Ad Library for ads by specific pages.")
@@ -202,16 +205,11 @@ def register(server: FastMCP, env: ToolEnvironment) -> None:
                 "after": args.after,
             }
             path = f"/{version}/ads_archive"
-            return await perform_graph_call(
-                env=env,
+            return await ad_library_get(
                 ctx=ctx,
-                method="GET",
                 path=path,
                 query=query,
-                body=None,
-                required_scopes=ADS_LIBRARY_SCOPES,
-                token_hint=TokenType.AD_ACCOUNT,
-                use_cache=True,
+                max_pages=args.max_pages,
             )
         except MCPException as exc:
             return failure(exc.error)
@@ -2,16 +2,16 @@
 
 from __future__ import annotations
 
-import hashlib
+import asyncio
 import hmac
-import json
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Mapping
 
 from mcp.server.fastmcp import FastMCP
 from starlette.requests import Request
 from starlette.responses import JSONResponse, PlainTextResponse, Response
 
+from .. import serialization
 from ..logging import get_logger
 from .common import ToolEnvironment
 
@@ -19,7 +19,7 @@ logger = get_logger(__name__)
 
 
 def register(server: FastMCP, env: ToolEnvironment) -> None:
-    secret = env.settings.app_secret.get_secret_value()
+    keyed_hmacs = _keyed_hmacs(env.settings.app_secret.get_secret_value())
     verify_token = env.settings.verify_token
 
     @server.custom_route("/webhooks/meta", methods=["GET"], name="meta_webhook_verify")
@@ -37,21 +37,27 @@ def register(server: FastMCP, env: ToolEnvironment) -> None:
     @server.custom_route("/webhooks/meta", methods=["POST"], name="meta_webhook_handler")
     async def handle(request: Request) -> Response:
         raw_body = await request.body()
-        if not _validate_signature(request.headers, raw_body, secret):
+        if not _validate_signature(request.headers, raw_body, keyed_hmacs):
             logger.error("webhook_signature_invalid")
             return JSONResponse({"ok": False, "reason": "invalid_signature"}, status_code=403)
 
         try:
-            payload = json.loads(raw_body.decode())
-        except json.JSONDecodeError:
+            payload = serialization.loads(raw_body)
+        except ValueError:
             logger.error("webhook_invalid_json")
             return JSONResponse({"ok": False, "reason": "invalid_json"}, status_code=400)
 
         entries = payload.get("entry", [])
-        normalized_count = 0
+        deliveries = []
+        received_at = datetime.now(timezone.utc)
         for entry in entries:
             topic = entry.get("object", "unknown")
-            delivered_at = datetime.fromtimestamp(entry.get("time", datetime.now(timezone.utc).timestamp()), tz=timezone.utc)
+            entry_time = entry.get("time")
+            delivered_at = (
+                received_at
+                if entry_time is None
+                else datetime.fromtimestamp(entry_time, tz=timezone.utc)
+            )
             for change in entry.get("changes", []) or []:
                 object_id = change.get("value", {}).get("id") or entry.get("id", "unknown")
                 event_payload = {
@@ -59,19 +65,36 @@ def register(server: FastMCP, env: ToolEnvironment) -> None:
                     "object_id": object_id,
                     "change": change,
                 }
-                await env.event_queue.record_delivery(
-                    topic=topic,
-                    object_id=str(object_id),
-                    payload=event_payload,
-                    delivered_at=delivered_at,
+                deliveries.append(
+                    env.event_queue.record_delivery(
+                        topic=topic,
+                        object_id=str(object_id),
+                        payload=event_payload,
+                        delivered_at=delivered_at,
+                    )
                 )
-                normalized_count += 1
+        # Recorded concurrently so the queue group-commits them in as few INSERTs as possible.
+        await asyncio.gather(*deliveries)
+        normalized_count = len(deliveries)
 
         logger.info("webhook_ingested", entries=len(entries), normalized=normalized_count)
         return JSONResponse({"ok": True, "ingested": normalized_count})
 
 
-def _validate_signature(headers: Any, body: bytes, secret: str) -> bool:
+def _keyed_hmacs(secret: str | bytes) -> dict[str, hmac.HMAC]:
+    """HMACs already fed the ``secret`` ipad/opad blocks, one per signature scheme."""
+
+    key = secret.encode() if isinstance(secret, str) else secret
+    return {scheme: hmac.new(key, digestmod=scheme) for scheme in ("sha1", "sha256")}
+
+
+def _validate_signature(headers: Any, body: bytes, keyed_hmacs: Mapping[str, hmac.HMAC]) -> bool:
+    """Check Meta's ``X-Hub-Signature(-256)`` header against an HMAC of ``body``.
+
+    ``keyed_hmacs`` comes from :func:`_keyed_hmacs`, built once at registration;
+    each check copies the keyed state so only ``body`` is hashed.
+    """
+
     signature = headers.get("X-Hub-Signature-256") or headers.get("X-Hub-Signature")
     if not signature:
         return False
@@ -79,12 +102,12 @@ def _validate_signature(headers: Any, body: bytes, secret: str) -> bool:
         scheme, value = signature.split("=", 1)
     except ValueError:
         return False
-    scheme = scheme.lower()
-    if scheme not in {"sha1", "sha256"}:
+    keyed = keyed_hmacs.get(scheme.lower())
+    if keyed is None:
         return False
-    digestmod = hashlib.sha1 if scheme == "sha1" else hashlib.sha256
-    expected = hmac.new(secret.encode(), body, digestmod).hexdigest()
-    return hmac.compare_digest(expected, value)
+    mac = keyed.copy()
+    mac.update(body)
+    return hmac.compare_digest(mac.hexdigest(), value)
 
 
 __all__ = ["register"]
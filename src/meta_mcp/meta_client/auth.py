@@ -5,17 +5,19 @@ from __future__ import annotations
 import asyncio
 import hashlib
 from collections import defaultdict, deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Iterable, Sequence
+from functools import lru_cache
+from typing import Any, Iterable, Sequence
 
+from sqlalchemy import Executable, Row, desc, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..errors import MCPException, McpError, McpErrorCode
-from sqlalchemy import desc, select
-
+from ..errors import McpError, McpErrorCode, MCPException
 from ..logging import get_logger
-from ..storage import SessionToken, Token, TokenType, session_scope
+from ..storage import SessionToken, Token, TokenType, read_connection, session_scope
 from .client import MetaGraphApiClient
 
 logger = get_logger(__name__)
@@ -24,17 +26,83 @@ REQUIRED_PPCA_SCOPE = "page_public_content_access"
 IG_BUSINESS_SCOPE = "instagram_basic"
 IG_PUBLISH_CAP = 25
 
+# Bit positions for the scopes the tools request. Scope checks on the hot path
+# reduce to ``required & ~granted``; scopes outside this table fall back to
+# set membership.
+_SCOPE_BITS: dict[str, int] = {
+    scope: 1 << bit
+    for bit, scope in enumerate(
+        (
+            "ads_management",
+            "ads_read",
+            "business_management",
+            "instagram_basic",
+            "instagram_content_publish",
+            "instagram_manage_comments",
+            "instagram_manage_insights",
+            "pages_manage_engagement",
+            "pages_manage_metadata",
+            "pages_manage_posts",
+            "pages_read_engagement",
+            "pages_read_insights",
+            "pages_read_user_content",
+            "pages_show_list",
+            REQUIRED_PPCA_SCOPE,
+        )
+    )
+}
+_PPCA_BIT = _SCOPE_BITS[REQUIRED_PPCA_SCOPE]
+
+
+@lru_cache(maxsize=256)
+def _scope_mask(scopes: tuple[str, ...]) -> tuple[int, tuple[str, ...]]:
+    """Return the bitmask of known scopes and the scopes outside ``_SCOPE_BITS``."""
+
+    mask = 0
+    unknown: list[str] = []
+    for scope in scopes:
+        bit = _SCOPE_BITS.get(scope)
+        if bit is None:
+            unknown.append(scope)
+        else:
+            mask |= bit
+    return mask, tuple(unknown)
+
+
+_DEBUG_TOKEN_TYPES = {
+    "PAGE": TokenType.PAGE,
+    "IG_USER": TokenType.INSTAGRAM,
+    "INSTAGRAM": TokenType.INSTAGRAM,
+    "BUSINESS": TokenType.SYSTEM_USER,
+    "USER": TokenType.SYSTEM_USER,
+    "ADACCOUNT": TokenType.AD_ACCOUNT,
+    "AD_ACCOUNT": TokenType.AD_ACCOUNT,
+    "SYSTEM_USER": TokenType.SYSTEM_USER,
+}
+# debug_token reports types in either case; index both spellings so the
+# common path never allocates an upper-cased copy.
+_TOKEN_TYPE_MAP: dict[str, TokenType] = {
+    **_DEBUG_TOKEN_TYPES,
+    **{key.lower(): value for key, value in _DEBUG_TOKEN_TYPES.items()},
+}
+
 
 @dataclass(slots=True)
 class TokenMetadata:
     token_hash: str
     type: TokenType
     subject_id: str
-    scopes: list[str]
+    scopes: tuple[str, ...]
     app_id: str
     issued_at: datetime
     expires_at: datetime | None
     metadata: dict[str, object]
+    scope_set: frozenset[str] = field(init=False, repr=False, compare=False)
+    scope_mask: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.scope_set = frozenset(self.scopes)
+        self.scope_mask = _scope_mask(self.scopes)[0]
 
     @property
     def is_expired(self) -> bool:
@@ -62,8 +130,10 @@ class TokenService:
         token_hint: TokenType | None = None,
     ) -> TokenMetadata:
         metadata = await self.inspect_token(access_token=access_token, token_hint=token_hint)
-        missing = [scope for scope in required_scopes if scope not in metadata.scopes]
-        if missing:
+        required_mask, unknown = _scope_mask(tuple(required_scopes))
+        granted = metadata.scope_set
+        if required_mask & ~metadata.scope_mask or any(scope not in granted for scope in unknown):
+            missing = [scope for scope in required_scopes if scope not in granted]
             raise MCPException(
                 McpError(
                     code=McpErrorCode.PERMISSION,
@@ -72,7 +142,7 @@ class TokenService:
                 )
             )
 
-        if require_ppca and REQUIRED_PPCA_SCOPE not in metadata.scopes:
+        if require_ppca and not metadata.scope_mask & _PPCA_BIT:
             raise MCPException(
                 McpError(
                     code=McpErrorCode.PERMISSION,
@@ -100,11 +170,12 @@ class TokenService:
     ) -> TokenMetadata:
         token_hash = self._hash_token(access_token)
 
-        async with session_scope() as session:
-            row = await session.get(Token, token_hash)
-            if row and not self._needs_refresh(row):
-                logger.debug("token_cache_hit", token_hash=token_hash, type=row.type.value)
-                return self._row_to_metadata(row)
+        async with read_connection() as conn:
+            result = await conn.execute(select(Token.__table__).where(Token.id == token_hash))
+            cached = result.first()
+        if cached and not self._needs_refresh(cached):
+            logger.debug("token_cache_hit", token_hash=token_hash, type=cached.type.value)
+            return self._row_to_metadata(cached)
 
         async with self._lock:
             async with session_scope() as session:
@@ -133,7 +204,7 @@ class TokenService:
                 else:
                     expiry = None
 
-                raw_type = (debug_info.get("type") or "user").upper()
+                raw_type = debug_info.get("type") or "USER"
                 token_type = self._map_type(raw_type, token_hint)
 
                 stored_metadata = {
@@ -154,7 +225,7 @@ class TokenService:
                 return self._row_to_metadata(orm_token)
 
     async def ensure_instagram_business(self, metadata: TokenMetadata) -> None:
-        if IG_BUSINESS_SCOPE not in metadata.scopes:
+        if IG_BUSINESS_SCOPE not in metadata.scope_set:
             raise MCPException(
                 McpError(
                     code=McpErrorCode.PERMISSION,
@@ -229,19 +300,19 @@ class TokenService:
     def _hash_token(self, token: str) -> str:
         return hashlib.sha256(token.encode()).hexdigest()
 
-    def _needs_refresh(self, token: Token) -> bool:
+    def _needs_refresh(self, token: Token | Row[Any]) -> bool:
         if token.expires_at is None:
             return False
         # Ensure token.expires_at is timezone-aware before comparison
         expires_at_aware = token.expires_at.replace(tzinfo=timezone.utc) if token.expires_at.tzinfo is None else token.expires_at
         return expires_at_aware <= datetime.now(timezone.utc) + timedelta(minutes=5)
 
-    def _row_to_metadata(self, row: Token) -> TokenMetadata:
+    def _row_to_metadata(self, row: Token | Row[Any]) -> TokenMetadata:
         return TokenMetadata(
             token_hash=row.id,
             type=row.type,
             subject_id=row.subject_id,
-            scopes=list(row.scopes),
+            scopes=tuple(row.scopes),
             app_id=row.app_id,
             issued_at=row.issued_at,
             expires_at=row.expires_at,
@@ -249,34 +320,34 @@ class TokenService:
         )
 
     async def _upsert(self, *, session: AsyncSession, token: Token) -> None:
-        existing = await session.get(Token, token.id)
-        if existing:
-            existing.type = token.type
-            existing.subject_id = token.subject_id
-            existing.scopes = token.scopes
-            existing.app_id = token.app_id
-            existing.issued_at = token.issued_at
-            existing.expires_at = token.expires_at
-            existing.raw_metadata = token.raw_metadata
+        dialect = session.get_bind().dialect.name
+        values = {column.key: getattr(token, column.key) for column in Token.__table__.columns}
+        updated = [key for key in values if key != "id"]
+        stmt: Executable
+        if dialect == "sqlite":
+            sqlite_stmt = sqlite_insert(Token).values(**values)
+            stmt = sqlite_stmt.on_conflict_do_update(
+                index_elements=[Token.id],
+                set_={key: sqlite_stmt.excluded[key] for key in updated},
+            )
+        elif dialect == "postgresql":
+            postgresql_stmt = postgresql_insert(Token).values(**values)
+            stmt = postgresql_stmt.on_conflict_do_update(
+                index_elements=[Token.id],
+                set_={key: postgresql_stmt.excluded[key] for key in updated},
+            )
         else:
-            session.add(token)
+            await session.merge(token)
+            return
+        await session.execute(stmt)
 
     def _map_type(self, raw_type: str, token_hint: TokenType | None) -> TokenType:
-        mapping = {
-            "PAGE": TokenType.PAGE,
-            "IG_USER": TokenType.INSTAGRAM,
-            "INSTAGRAM": TokenType.INSTAGRAM,
-            "BUSINESS": TokenType.SYSTEM_USER,
-            "USER": TokenType.SYSTEM_USER,
-            "ADACCOUNT": TokenType.AD_ACCOUNT,
-            "AD_ACCOUNT": TokenType.AD_ACCOUNT,
-            "SYSTEM_USER": TokenType.SYSTEM_USER,
-        }
         if token_hint:
             return token_hint
-        if raw_type in mapping:
-            return mapping[raw_type]
-        return TokenType.SYSTEM_USER
+        token_type = _TOKEN_TYPE_MAP.get(raw_type)
+        if token_type is None:
+            token_type = _TOKEN_TYPE_MAP.get(raw_type.upper(), TokenType.SYSTEM_USER)
+        return token_type
 
 
 async def ensure_required_scopes(
@@ -3,77 +3,266 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import hashlib
-import json
 import random
 import time
 from collections import defaultdict, deque
 from datetime import datetime, timezone
-from typing import Any, AsyncIterator, MutableMapping
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, MutableMapping
 
 import httpx
-from cachetools import LRUCache
+from cachetools import TTLCache
 
-from ..config import get_settings
+from .. import serialization
+from ..config import MetaMcpSettings, get_settings
 from ..errors import MCPException, McpError, McpErrorCode
 from ..logging import get_logger
 
 logger = get_logger(__name__)
 
 
+def _freeze(value: Any) -> Hashable:
+    """Convert JSON-like data into an order-insensitive hashable key."""
+
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a ``Retry-After`` header in delay-seconds or HTTP-date form."""
+
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@functools.lru_cache(maxsize=1024)
+def _token_digest(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+_USAGE_HEADERS = ("x-app-usage", "x-business-use-case-usage", "x-ad-account-usage", "fbtrace_id")
+
+# Errors the transport's own connect retry has already retried.
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+# Cached bodies are stored decoded, so these must not be replayed on cache hits.
+_TRANSPORT_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+
+@functools.lru_cache(maxsize=256)
+def _auth_headers(token: str) -> tuple[tuple[str, str], ...]:
+    return (("Authorization", f"Bearer {token}"),)
+
+
 class SlidingWindowRateLimiter:
-    """Simple sliding-window limiter per key."""
+    """Simple sliding-window limiter per key.
+
+    Reservations are synchronous, so they are atomic with respect to the event loop
+    and need no lock; callers with spare capacity never yield. Callers that must wait
+    queue in FIFO order on a per-key lock so a throttled key never delays another key,
+    and the lock-free path is closed while anyone is queued so freed slots go to the
+    longest waiter rather than to new arrivals.
+    """
 
     def __init__(self, capacity: int, window_seconds: float = 60.0) -> None:
         self.capacity = capacity
         self.window_seconds = window_seconds
-        self._events: dict[str, deque[float]] = defaultdict(deque)
-        self._lock = asyncio.Lock()
+        self._events: dict[str, deque[float]] = {}
+        self._locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._waiting: dict[str, int] = defaultdict(int)
 
     async def acquire(self, key: str = "global") -> None:
-        async with self._lock:
-            now = time.monotonic()
-            queue = self._events[key]
-            while queue and now - queue[0] >= self.window_seconds:
-                queue.popleft()
-            if len(queue) >= self.capacity:
-                wait_time = self.window_seconds - (now - queue[0])
-                await asyncio.sleep(max(wait_time, 0))
-                return await self.acquire(key)
+        if not self._waiting[key] and not self._try_acquire(key):
+            return
+        self._waiting[key] += 1
+        try:
+            async with self._locks[key]:
+                while True:
+                    wait_time = self._try_acquire(key)
+                    if not wait_time:
+                        return
+                    await asyncio.sleep(wait_time)
+        finally:
+            self._waiting[key] -= 1
+
+    def _try_acquire(self, key: str) -> float:
+        """Record an event for ``key`` if allowed, otherwise return seconds to wait."""
+
+        now = time.monotonic()
+        queue = self._events.get(key)
+        if queue is None:
+            queue = self._events[key] = deque(maxlen=self.capacity)
+        # The ring holds the last ``capacity`` events; a full ring admits a new one only
+        # once its oldest entry has left the window, and append() evicts that entry.
+        if len(queue) < self.capacity or now - queue[0] >= self.window_seconds:
             queue.append(now)
+            return 0.0
+        return self.window_seconds - (now - queue[0])
 
 
 class BackoffStrategy:
-    def __init__(self, factor: float, maximum: float) -> None:
+    """Exponential backoff with full jitter so concurrent retries spread out."""
+
+    def __init__(
+        self,
+        factor: float,
+        maximum: float,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
         self.factor = factor
         self.maximum = maximum
+        self._random = random.Random()
+        self._sleep = sleep
 
     async def sleep(self, attempt: int) -> None:
-        delay = min(self.maximum, (2**attempt) * self.factor)
-        jitter = random.random() * 0.1 * delay
-        await asyncio.sleep(delay + jitter)
+        cap = min(self.maximum, (2**attempt) * self.factor)
+        await self._sleep(self._random.uniform(0, cap))
+
+    async def wait(self, delay: float) -> None:
+        """Sleep for a server-requested ``delay`` through the same injected sleep."""
+
+        await self._sleep(delay)
+
+
+class _RequestBatcher:
+    """Coalesce concurrent GETs for one access token into Graph ``/batch`` calls.
+
+    Operations submitted within ``window`` seconds (or until ``max_size`` are queued)
+    are sent as one batch. A ``None`` result tells the caller to issue the request
+    directly, which happens for lone operations and for sub-requests Meta did not
+    complete.
+    """
+
+    def __init__(
+        self,
+        client: MetaGraphApiClient,
+        *,
+        access_token: str,
+        window: float,
+        max_size: int = 50,
+    ) -> None:
+        self._client = client
+        self._access_token = access_token
+        self._window = window
+        self._max_size = max_size
+        self._pending: list[tuple[dict[str, Any], asyncio.Future[dict[str, Any] | None]]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def idle(self) -> bool:
+        return not self._pending
+
+    async def submit(self, operation: dict[str, Any]) -> dict[str, Any] | None:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[dict[str, Any] | None] = loop.create_future()
+        self._pending.append((operation, future))
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if len(pending) == 1:
+            _, future = pending[0]
+            if not future.done():
+                future.set_result(None)
+        elif pending:
+            task = asyncio.get_running_loop().create_task(self._dispatch(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(
+        self, pending: list[tuple[dict[str, Any], asyncio.Future[dict[str, Any] | None]]]
+    ) -> None:
+        try:
+            results = await self._client.batch(
+                access_token=self._access_token,
+                operations=[operation for operation, _ in pending],
+            )
+        except Exception as exc:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for index, (_, future) in enumerate(pending):
+            if not future.done():
+                future.set_result(results[index] if index < len(results) else None)
 
 
 class MetaGraphApiClient:
     """HTTP client with resiliency decorators for Meta APIs."""
 
-    def __init__(self) -> None:
-        self.settings = get_settings()
+    def __init__(
+        self,
+        *,
+        settings: MetaMcpSettings | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.settings = settings or get_settings()
         timeout = httpx.Timeout(self.settings.default_timeout_seconds)
+        limits = httpx.Limits(
+            max_connections=100, max_keepalive_connections=50, keepalive_expiry=60.0
+        )
         self._client = httpx.AsyncClient(
             base_url=self.settings.graph_api_base_url,
             timeout=timeout,
             headers={"Accept": "application/json"},
+            # Failed connects are retried once by the transport and not again by _fetch().
+            transport=transport
+            or httpx.AsyncHTTPTransport(retries=1, http2=self.settings.http2, limits=limits),
         )
         self._backoff = BackoffStrategy(
             factor=self.settings.retry_backoff_factor,
             maximum=self.settings.retry_backoff_max,
+            sleep=sleep,
         )
         self._global_limiter = SlidingWindowRateLimiter(self.settings.rate_limit_per_app)
         self._token_limiter = SlidingWindowRateLimiter(self.settings.rate_limit_per_token)
-        self._cache: LRUCache[str, Any] | None = None
+        self._cache: TTLCache[Hashable, Any] | None = None
         if self.settings.cache_maxsize:
-            self._cache = LRUCache(maxsize=self.settings.cache_maxsize)
+            self._cache = TTLCache(
+                maxsize=self.settings.cache_maxsize, ttl=self.settings.cache_ttl_seconds
+            )
+        self._batch_window = self.settings.batch_window_seconds
+        self._batchers: dict[str, _RequestBatcher] = {}
+        self._inflight: dict[Hashable, asyncio.Future[httpx.Response]] = {}
+
+    @property
+    def settings(self) -> MetaMcpSettings:
+        return self._settings
+
+    @settings.setter
+    def settings(self, settings: MetaMcpSettings) -> None:
+        # Values read on every request are derived once here rather than per call.
+        self._settings = settings
+        self._max_retries = settings.max_retries
+        self._batch_path = f"/{settings.graph_api_version}/batch"
+        self._debug_token_path = f"/{settings.graph_api_version}/debug_token"
+        self._app_access_token = f"{settings.app_id}|{settings.app_secret.get_secret_value()}"
 
     async def aclose(self) -> None:
         await self._client.aclose()
@@ -96,29 +285,183 @@ class MetaGraphApiClient:
         files: dict[str, Any] | None = None,
         idempotency_key: str | None = None,
         use_cache: bool = False,
+        cache_key: Hashable | None = None,
     ) -> httpx.Response:
+        response, _ = await self._send(
+            access_token=access_token,
+            method=method,
+            path=path,
+            query=query,
+            json_body=json_body,
+            form_body=form_body,
+            files=files,
+            idempotency_key=idempotency_key,
+            use_cache=use_cache,
+            cache_key=cache_key,
+            decode=False,
+        )
+        return response
+
+    async def request_with_json(
+        self,
+        *,
+        access_token: str,
+        method: str,
+        path: str,
+        query: dict[str, Any] | None = None,
+        json_body: dict[str, Any] | None = None,
+        form_body: dict[str, Any] | None = None,
+        files: dict[str, Any] | None = None,
+        idempotency_key: str | None = None,
+        use_cache: bool = False,
+        cache_key: Hashable | None = None,
+    ) -> tuple[httpx.Response, Any]:
+        """Like :meth:`request` but also return the body decoded once, shared with the cache.
+
+        The decoded body is ``None`` when the response is not JSON.
+        """
+
+        return await self._send(
+            access_token=access_token,
+            method=method,
+            path=path,
+            query=query,
+            json_body=json_body,
+            form_body=form_body,
+            files=files,
+            idempotency_key=idempotency_key,
+            use_cache=use_cache,
+            cache_key=cache_key,
+            decode=True,
+        )
+
+    async def request_json(
+        self,
+        *,
+        access_token: str,
+        method: str,
+        path: str,
+        query: dict[str, Any] | None = None,
+        json_body: dict[str, Any] | None = None,
+        use_cache: bool = False,
+        cache_key: Hashable | None = None,
+    ) -> Any:
+        """Like :meth:`request` but return only the decoded body."""
+
+        response, payload = await self.request_with_json(
+            access_token=access_token,
+            method=method,
+            path=path,
+            query=query,
+            json_body=json_body,
+            use_cache=use_cache,
+            cache_key=cache_key,
+        )
+        if payload is None:
+            # Surface the decode error for non-JSON bodies; a literal ``null`` stays None.
+            return response.json()
+        return payload
+
+    async def _send(
+        self,
+        *,
+        access_token: str,
+        method: str,
+        path: str,
+        query: dict[str, Any] | None,
+        json_body: dict[str, Any] | None,
+        form_body: dict[str, Any] | None,
+        files: dict[str, Any] | None,
+        idempotency_key: str | None,
+        use_cache: bool,
+        cache_key: Hashable | None,
+        decode: bool,
+    ) -> tuple[httpx.Response, Any]:
         if not path.startswith("/"):
             path = f"/{path}"
 
         if query:
             query = {k: v for k, v in query.items() if v is not None}
-        cache_key = self._cache_key(method, path, query, json_body)
         if json_body is not None and (form_body is not None or files is not None):
             raise ValueError("Cannot send both JSON and form data in the same request")
 
-        if use_cache and self._cache and cache_key in self._cache:
-            logger.debug("cache_hit", path=path)
-            return self._build_cached_response(method=method, path=path, query=query, cached=self._cache[cache_key])
+        token_key = self._hash_token(access_token)
+        cache = self._cache if use_cache else None
+        if cache is not None:
+            if cache_key is None:
+                cache_key = self._cache_key(method, path, query, json_body)
+            # Scope entries to the token so responses never leak across tenants.
+            cache_key = (token_key, cache_key)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.debug("cache_hit", path=path)
+                return self._build_cached_response(cached), cached["json"]
+
+        fetch = functools.partial(
+            self._fetch,
+            access_token=access_token,
+            token_key=token_key,
+            method=method,
+            path=path,
+            query=query,
+            json_body=json_body,
+            form_body=form_body,
+            files=files,
+            idempotency_key=idempotency_key,
+        )
+        if (method == "GET" or idempotency_key is not None) and form_body is None and files is None:
+            # Single-flight: identical concurrent calls share one upstream request.
+            flight_key = (
+                token_key,
+                idempotency_key or self._cache_key(method, path, query, json_body),
+            )
+            inflight = self._inflight.get(flight_key)
+            if inflight is None:
+                inflight = asyncio.ensure_future(self._fetch_once(flight_key, fetch))
+                self._inflight[flight_key] = inflight
+            response = await asyncio.shield(inflight)
+        else:
+            response = await fetch()
+        return self._complete(response, cache=cache, cache_key=cache_key, decode=decode)
+
+    async def _fetch_once(
+        self, flight_key: Hashable, fetch: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        try:
+            return await fetch()
+        finally:
+            # Released before the result is published, so a caller arriving after
+            # completion starts a fresh request instead of replaying this one.
+            self._inflight.pop(flight_key, None)
 
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-        }
-        if idempotency_key:
-            headers["Idempotency-Key"] = idempotency_key
+    async def _fetch(
+        self,
+        *,
+        access_token: str,
+        token_key: str,
+        method: str,
+        path: str,
+        query: dict[str, Any] | None,
+        json_body: dict[str, Any] | None,
+        form_body: dict[str, Any] | None,
+        files: dict[str, Any] | None,
+        idempotency_key: str | None,
+    ) -> httpx.Response:
+        if self._batch_window and method == "GET" and idempotency_key is None:
+            batched = await self._batched_get(access_token=access_token, path=path, query=query)
+            if batched is not None:
+                return batched
 
-        for attempt in range(self.settings.max_retries + 1):
-            await self._global_limiter.acquire()
-            await self._token_limiter.acquire(self._hash_token(access_token))
+        headers = _auth_headers(access_token)
+        if idempotency_key:
+            headers += (("Idempotency-Key", idempotency_key),)
+
+        # Meta bills every sub-request of a /batch call, so it takes one slot per operation.
+        cost = len(json_body["batch"]) if path == self._batch_path and json_body else 1
+        for attempt in range(self._max_retries + 1):
+            for _ in range(cost):
+                await self._global_limiter.acquire()
+                await self._token_limiter.acquire(token_key)
             try:
                 response = await self._client.request(
                     method=method,
@@ -129,9 +472,10 @@ class MetaGraphApiClient:
                     files=files,
                     headers=headers,
                 )
-                await response.aread()
-            except httpx.RequestError as exc:  # pragma: no cover - network failure
-                if attempt == self.settings.max_retries:
+            except httpx.RequestError as exc:
+                # The transport already retried failed connects, so only other transport
+                # errors (e.g. read timeouts) spend the retry budget here.
+                if attempt == self._max_retries or isinstance(exc, _CONNECT_ERRORS):
                     raise MCPException(
                         McpError(
                             code=McpErrorCode.REMOTE_5XX,
@@ -143,19 +487,13 @@ class MetaGraphApiClient:
                 continue
 
             if response.status_code == 429 or response.status_code >= 500:
-                if attempt == self.settings.max_retries:
+                if attempt == self._max_retries:
                     raise self._map_error(response)
-                await self._respect_retry_after(response)
-                await self._backoff.sleep(attempt)
+                if not await self._respect_retry_after(response):
+                    await self._backoff.sleep(attempt)
                 continue
 
             if response.is_success:
-                if use_cache and self._cache is not None:
-                    self._cache[cache_key] = {
-                        "status": response.status_code,
-                        "headers": dict(response.headers),
-                        "json": response.json(),
-                    }
                 return response
 
             raise self._map_error(response)
@@ -181,13 +519,13 @@ class MetaGraphApiClient:
                     message="Batch operations cannot exceed 50",
                 )
             )
-        response = await self.request(
+        results: list[dict[str, Any]] = await self.request_json(
             access_token=access_token,
             method="POST",
-            path=f"/{self.settings.graph_api_version}/batch",
+            path=self._batch_path,
             json_body={"batch": operations},
         )
-        return response.json()
+        return results
 
     async def paginate(
         self,
@@ -198,49 +536,126 @@ class MetaGraphApiClient:
         query: dict[str, Any] | None = None,
     ) -> AsyncIterator[dict[str, Any]]:
         params = dict(query or {})
-        while True:
-            response = await self.request(
-                access_token=access_token,
-                method=method,
-                path=path,
-                query=params,
-            )
-            payload = response.json()
-            yield payload
-            paging = payload.get("paging") or {}
-            cursors = paging.get("cursors") or {}
-            if "after" not in cursors:
-                break
-            params["after"] = cursors["after"]
-
-    def _build_cached_response(
+        next_page: asyncio.Task[Any] | None = None
+        payload = await self.request_json(
+            access_token=access_token,
+            method=method,
+            path=path,
+            query=params,
+        )
+        try:
+            while True:
+                paging = payload.get("paging") or {}
+                cursors = paging.get("cursors") or {}
+                if "after" not in cursors:
+                    yield payload
+                    return
+                # Start fetching the next page while the caller works on this one.
+                params = {**params, "after": cursors["after"]}
+                next_page = asyncio.create_task(
+                    self.request_json(
+                        access_token=access_token,
+                        method=method,
+                        path=path,
+                        query=params,
+                    )
+                )
+                yield payload
+                payload = await next_page
+                next_page = None
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await next_page
+
+    async def _batched_get(
         self,
         *,
-        method: str,
+        access_token: str,
         path: str,
         query: dict[str, Any] | None,
-        cached: dict[str, Any],
-    ) -> httpx.Response:
-        request = httpx.Request(
-            method=method,
-            url=self._client.base_url.join(path),
-            params=query,
+    ) -> httpx.Response | None:
+        key = self._hash_token(access_token)
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            batcher = _RequestBatcher(self, access_token=access_token, window=self._batch_window)
+            self._batchers[key] = batcher
+        relative_url = path.lstrip("/")
+        if query:
+            relative_url = f"{relative_url}?{httpx.QueryParams(query)}"
+        try:
+            result = await batcher.submit({"method": "GET", "relative_url": relative_url})
+        finally:
+            if batcher.idle and self._batchers.get(key) is batcher:
+                del self._batchers[key]
+        if result is None:
+            return None
+
+        response = httpx.Response(
+            status_code=int(result.get("code") or 500),
+            headers=[(header["name"], header["value"]) for header in result.get("headers") or []],
+            content=(result.get("body") or "").encode(),
+            request=httpx.Request("GET", self._client.base_url.join(path), params=query),
         )
+        if response.is_success:
+            return response
+        if response.status_code == 429 or response.status_code >= 500:
+            # Let the direct path apply its retry/backoff policy.
+            return None
+        raise self._map_error(response)
+
+    def _complete(
+        self,
+        response: httpx.Response,
+        *,
+        cache: TTLCache[Hashable, Any] | None,
+        cache_key: Hashable,
+        decode: bool,
+    ) -> tuple[httpx.Response, Any]:
+        if cache is None and not decode:
+            return response, None
+        try:
+            payload = serialization.loads(response.content)
+        except ValueError:
+            if cache is not None:
+                raise
+            return response, None
+        if cache is not None:
+            cache[cache_key] = {
+                "status": response.status_code,
+                "headers": {
+                    key: value
+                    for key, value in response.headers.items()
+                    if key not in _TRANSPORT_HEADERS
+                },
+                "json": payload,
+                "content": response.content,
+                "request": response.request,
+            }
+        return response, payload
+
+    @staticmethod
+    def _build_cached_response(cached: dict[str, Any]) -> httpx.Response:
         return httpx.Response(
             status_code=cached["status"],
             headers=cached["headers"],
-            json=cached["json"],
-            request=request,
+            content=cached["content"],
+            request=cached["request"],
         )
 
-    async def _respect_retry_after(self, response: httpx.Response) -> None:
-        retry_after = response.headers.get("Retry-After")
-        if retry_after is not None:
-            try:
-                delay = float(retry_after)
-            except ValueError:  # pragma: no cover - seconds since date format
-                delay = 0.0
-            await asyncio.sleep(delay)
+    async def _respect_retry_after(self, response: httpx.Response) -> bool:
+        """Sleep for the server-provided ``Retry-After``; return whether a wait was honoured.
+
+        The wait is capped at ``retry_after_max_seconds`` so a far-future date cannot
+        stall the request.
+        """
+
+        delay = _parse_retry_after(response.headers.get("Retry-After"))
+        if delay is None or delay <= 0:
+            return False
+        await self._backoff.wait(min(delay, self.settings.retry_after_max_seconds))
+        return True
 
     def _cache_key(
         self,
@@ -248,43 +663,31 @@ class MetaGraphApiClient:
         path: str,
         query: dict[str, Any] | None,
         json_body: dict[str, Any] | None,
-    ) -> str:
-        data = json.dumps(
-            {
-                "method": method,
-                "path": path,
-                "query": query or {},
-                "json": json_body or {},
-            },
-            sort_keys=True,
-        )
-        return hashlib.sha1(data.encode()).hexdigest()
+    ) -> Hashable:
+        query = query or {}
+        nested = any(isinstance(value, (dict, list, tuple)) for value in query.values())
+        if not json_body and not nested:
+            # Common GET shape: flat scalar query, so skip the recursive freeze (same key
+            # either way).
+            return (method, path, tuple(sorted(query.items())), ())
+        return (method, path, _freeze(query), _freeze(json_body or {}))
 
     def _hash_token(self, token: str) -> str:
-        return hashlib.sha1(token.encode()).hexdigest()
+        return _token_digest(token)
 
     def _map_error(self, response: httpx.Response) -> MCPException:
-        meta: MutableMapping[str, Any] = {}
-        for header in [
-            "x-app-usage",
-            "x-business-use-case-usage",
-            "x-ad-account-usage",
-            "fbtrace_id",
-        ]:
-            value = response.headers.get(header)
-            if value:
-                meta[header] = value
-
-        retry_after = None
-        if "Retry-After" in response.headers:
-            try:
-                retry_after = float(response.headers["Retry-After"])
-            except ValueError:
-                retry_after = None
+        headers = response.headers
+        meta: MutableMapping[str, Any] = {
+            header: value for header in _USAGE_HEADERS if (value := headers.get(header))
+        }
+
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
 
         try:
             payload = response.json()
-        except json.JSONDecodeError:
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
             payload = {"error": {"message": response.text}}
 
         err = payload.get("error", {})
@@ -337,18 +740,18 @@ class MetaGraphApiClient:
         return McpErrorCode.VALIDATION
 
     async def debug_token(self, *, access_token: str) -> dict[str, Any]:
-        response = await self.request(
+        payload = await self.request_json(
             access_token=self.settings.system_user_access_token.get_secret_value()
             if self.settings.system_user_access_token
             else access_token,
             method="GET",
-            path=f"/{self.settings.graph_api_version}/debug_token",
+            path=self._debug_token_path,
             query={
                 "input_token": access_token,
-                "access_token": f"{self.settings.app_id}|{self.settings.app_secret.get_secret_value()}",
+                "access_token": self._app_access_token,
             },
         )
-        data = response.json().get("data", {})
+        data = payload.get("data", {})
         expires_at = None
         if exp := data.get("expires_at"):
             expires_at = datetime.fromtimestamp(exp, tz=timezone.utc)
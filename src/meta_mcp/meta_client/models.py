@@ -91,24 +91,28 @@ class ResearchPublicPagesPostsList(BaseModel):
     until: datetime | None = None
     after: str | None = None
     limit: int | None = Field(default=None, ge=1, le=100)
+    max_pages: int = Field(default=1, ge=1, le=10)
 
 
 class ResearchPublicPagesPostCommentsList(BaseModel):
     post_id: str
     after: str | None = None
     limit: int | None = Field(default=None, ge=1, le=100)
+    max_pages: int = Field(default=1, ge=1, le=10)
 
 
 class ResearchPublicIgMediaList(BaseModel):
     ig_user_id: str
     after: str | None = None
     limit: int | None = Field(default=None, ge=1, le=100)
+    max_pages: int = Field(default=1, ge=1, le=10)
 
 
 class ResearchPublicIgMediaCommentsList(BaseModel):
     ig_media_id: str
     after: str | None = None
     limit: int | None = Field(default=None, ge=1, le=100)
+    max_pages: int = Field(default=1, ge=1, le=10)
 
 
 class ResearchObjectReactions(BaseModel):
@@ -155,6 +159,7 @@ class AdLibrarySearch(BaseModel):
     fields: Sequence[str]
     limit: int | None = Field(default=None, ge=1, le=100)
     after: str | None = None
+    max_pages: int = Field(default=1, ge=1, le=10)
 
 
 class AdLibraryByPage(BaseModel):
@@ -164,6 +169,7 @@ class AdLibraryByPage(BaseModel):
     fields: Sequence[str]
     limit: int | None = Field(default=None, ge=1, le=100)
     after: str | None = None
+    max_pages: int = Field(default=1, ge=1, le=10)
 
 
 class AssetsPageMediaList(BaseModel):
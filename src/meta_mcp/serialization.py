@@ -0,0 +1,134 @@
+"""JSON encoding helpers backed by orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+import math
+from json.encoder import encode_basestring
+from typing import Any
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - exercised without the speedups extra
+    orjson = None  # type: ignore[assignment]
+
+_LITERALS = {None: "null", True: "true", False: "false"}
+
+# Layout thresholds of ryu's formatter, which orjson uses for floats: plain decimal
+# notation while the decimal point lies within these bounds, exponent form outside.
+_MAX_DECIMAL_POINT = 16
+_MIN_DECIMAL_POINT = -5
+
+
+def dumps(value: Any, *, sort_keys: bool = False) -> bytes:
+    """Serialise ``value`` to compact UTF-8 JSON bytes.
+
+    Non-string keys are written as strings. With ``sort_keys`` the output is
+    canonical: the bytes are identical whether or not orjson is installed, so they
+    are safe to hash.
+    """
+
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(value, option=option)
+        except orjson.JSONEncodeError:
+            # orjson rejects some valid input (e.g. integers beyond 64 bits); those
+            # values fall through to the pure-Python encoders below.
+            pass
+    if sort_keys:
+        chunks: list[str] = []
+        _encode_canonical(value, chunks)
+        return "".join(chunks).encode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or text."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _encode_canonical(value: Any, chunks: list[str]) -> None:
+    """Append the sorted-key encoding of ``value`` to ``chunks``, formatted as orjson does."""
+
+    if isinstance(value, str):
+        chunks.append(encode_basestring(value))
+    elif value is None or isinstance(value, bool):
+        chunks.append(_LITERALS[value])
+    elif isinstance(value, int):
+        chunks.append(int.__repr__(value))
+    elif isinstance(value, float):
+        chunks.append(_format_float(value))
+    elif isinstance(value, dict):
+        items = sorted(((_format_key(key), item) for key, item in value.items()), key=_first)
+        chunks.append("{")
+        for index, (key, item) in enumerate(items):
+            if index:
+                chunks.append(",")
+            chunks.append(encode_basestring(key))
+            chunks.append(":")
+            _encode_canonical(item, chunks)
+        chunks.append("}")
+    elif isinstance(value, (list, tuple)):
+        chunks.append("[")
+        for index, item in enumerate(value):
+            if index:
+                chunks.append(",")
+            _encode_canonical(item, chunks)
+        chunks.append("]")
+    else:
+        raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _first(item: tuple[str, Any]) -> str:
+    return item[0]
+
+
+def _format_key(key: Any) -> str:
+    if isinstance(key, str):
+        return str.__str__(key)
+    if key is None or isinstance(key, bool):
+        return _LITERALS[key]
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return _format_float(key)
+    raise TypeError(f"Dict key must be str, int, float, bool or None: {type(key).__name__}")
+
+
+def _format_float(value: float) -> str:
+    """Format ``value`` with the shortest round-trip digits in orjson's (ryu's) layout."""
+
+    if not math.isfinite(value):
+        return "null"
+    if value == 0:
+        return "-0.0" if math.copysign(1.0, value) < 0 else "0.0"
+    text = float.__repr__(value)
+    sign = ""
+    if text[0] == "-":
+        sign, text = "-", text[1:]
+    mantissa, _, exp = text.partition("e")
+    whole, _, fraction = mantissa.partition(".")
+    digits = (whole + fraction).lstrip("0")
+    stripped = digits.rstrip("0")
+    exponent = int(exp or 0) - len(fraction) + len(digits) - len(stripped)
+    digits = stripped
+    # ``point`` is where the decimal point falls relative to the digits.
+    point = len(digits) + exponent
+    if exponent >= 0 and point <= _MAX_DECIMAL_POINT:
+        body = f"{digits}{'0' * exponent}.0"
+    elif 0 < point <= _MAX_DECIMAL_POINT:
+        body = f"{digits[:point]}.{digits[point:]}"
+    elif _MIN_DECIMAL_POINT < point <= 0:
+        body = f"0.{'0' * -point}{digits}"
+    elif len(digits) == 1:
+        body = f"{digits}e{point - 1}"
+    else:
+        body = f"{digits[0]}.{digits[1:]}e{point - 1}"
+    return sign + body
+
+
+__all__ = ["dumps", "loads"]
@@ -2,42 +2,113 @@
 
 from __future__ import annotations
 
+import threading
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
-
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
-
-from ..config import get_settings
+from typing import Any, AsyncIterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from .. import serialization
+from ..config import MetaMcpSettings, get_settings
 from .models import Base
 
 
+# Engine construction never awaits, so coroutines cannot interleave inside it;
+# the lock only guards threads (e.g. ``asyncio.to_thread`` callers).
+_init_lock = threading.Lock()
 _engine: AsyncEngine | None = None
 _SessionFactory: async_sessionmaker[AsyncSession] | None = None
 
 
+def _json_serializer(value: object) -> str:
+    return serialization.dumps(value).decode()
+
+
+def _pool_options(settings: MetaMcpSettings) -> dict[str, Any]:
+    url = make_url(settings.database_url)
+    if url.get_backend_name() == "sqlite":
+        # Sizing options do not apply to SQLite; an in-memory database must keep its
+        # single connection so the data survives checkouts.
+        if url.database in (None, "", ":memory:") or url.query.get("mode") == "memory":
+            return {"poolclass": StaticPool}
+        return {}
+    # Network databases can drop idle connections, so checkouts are pinged first.
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": True,
+    }
+
+
+def _configure_sqlite(dbapi_connection: Any, _connection_record: Any) -> None:
+    """Use WAL so commits append to the log instead of fsyncing the database file."""
+
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
 def get_engine() -> AsyncEngine:
     """Return singleton async engine."""
 
     global _engine, _SessionFactory
-    if _engine is None:
-        settings = get_settings()
-        _engine = create_async_engine(settings.database_url, echo=False, future=True)
-        _SessionFactory = async_sessionmaker(bind=_engine, expire_on_commit=False)
+    if _engine is not None:
+        return _engine
+    with _init_lock:
+        if _engine is None:
+            settings = get_settings()
+            engine = create_async_engine(
+                settings.database_url,
+                echo=False,
+                future=True,
+                json_serializer=_json_serializer,
+                json_deserializer=serialization.loads,
+                **_pool_options(settings),
+            )
+            if engine.dialect.name == "sqlite":
+                event.listen(engine.sync_engine, "connect", _configure_sqlite)
+            _SessionFactory = async_sessionmaker(bind=engine, expire_on_commit=False)
+            _engine = engine
     return _engine
 
 
 def get_session_factory() -> async_sessionmaker[AsyncSession]:
-    engine = get_engine()
+    if _SessionFactory is None:
+        get_engine()
     assert _SessionFactory is not None  # for type checkers, set when engine is built
     return _SessionFactory
 
 
+async def dispose_engine() -> None:
+    """Dispose the singleton engine so the next use rebuilds it from current settings."""
+
+    global _engine, _SessionFactory
+    with _init_lock:
+        engine, _engine, _SessionFactory = _engine, None, None
+    if engine is not None:
+        await engine.dispose()
+
+
 @asynccontextmanager
 async def session_scope() -> AsyncIterator[AsyncSession]:
     """Provide a transactional scope for database work."""
 
-    factory = get_session_factory()
-    session = factory()
+    session = (_SessionFactory or get_session_factory())()
     try:
         yield session
         await session.commit()
@@ -48,6 +119,22 @@ async def session_scope() -> AsyncIterator[AsyncSession]:
         await session.close()
 
 
+@asynccontextmanager
+async def read_connection() -> AsyncIterator[AsyncConnection]:
+    """Provide a bare connection for read-only lookups without ORM session overhead."""
+
+    async with get_engine().connect() as conn:
+        yield conn
+
+
+@asynccontextmanager
+async def transaction_scope() -> AsyncIterator[AsyncConnection]:
+    """Provide a pooled connection inside ``BEGIN``/``COMMIT`` for Core statements."""
+
+    async with get_engine().begin() as conn:
+        yield conn
+
+
 async def init_models() -> None:
     """Create database tables if they do not exist (development only)."""
 
@@ -56,4 +143,12 @@ async def init_models() -> None:
         await conn.run_sync(Base.metadata.create_all)
 
 
-__all__ = ["get_engine", "session_scope", "init_models", "get_session_factory"]
+__all__ = [
+    "get_engine",
+    "dispose_engine",
+    "session_scope",
+    "read_connection",
+    "transaction_scope",
+    "init_models",
+    "get_session_factory",
+]
@@ -6,8 +6,54 @@ import enum
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import JSON, CheckConstraint, DateTime, Enum, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    CheckConstraint,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Dialect
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+from .. import serialization
+
+# Binary JSONB on Postgres (parsed once on write, GIN-indexable); generic JSON elsewhere.
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class PackedJSON(TypeDecorator[Any]):
+    """JSON document stored as compact UTF-8 bytes outside Postgres.
+
+    Postgres keeps ``JSONB`` so the payload stays indexable; elsewhere values are
+    encoded with :mod:`meta_mcp.serialization` into a BLOB. Rows written as JSON
+    text by earlier versions still decode, since ``loads`` accepts both forms.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[Any]:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> Any:
+        if value is None or dialect.name == "postgresql":
+            return value
+        return serialization.dumps(value)
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> Any:
+        if value is None or dialect.name == "postgresql":
+            return value
+        return serialization.loads(value)
 
 
 class Base(DeclarativeBase):
@@ -27,11 +73,11 @@ class Token(Base):
     id: Mapped[str] = mapped_column(String(255), primary_key=True)
     type: Mapped[TokenType] = mapped_column(Enum(TokenType, name="token_type"), nullable=False)
     subject_id: Mapped[str] = mapped_column(String(255), nullable=False)
-    scopes: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
+    scopes: Mapped[list[str]] = mapped_column(JSONType, nullable=False, default=list)
     app_id: Mapped[str] = mapped_column(String(64), nullable=False)
     issued_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
-    raw_metadata: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    raw_metadata: Mapped[dict[str, Any]] = mapped_column(JSONType, nullable=False, default=dict)
 
 
 class WebhookEvent(Base):
@@ -40,10 +86,24 @@ class WebhookEvent(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     topic: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
     object_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
-    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(PackedJSON, nullable=False)
     delivered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
+    __table_args__ = (
+        Index("ix_webhook_events_payload_gin", "payload", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+        # Partial index in delivery order: dequeue's ORDER BY ... LIMIT becomes a bounded
+        # index walk.
+        Index(
+            "ix_webhook_events_unprocessed",
+            "delivered_at",
+            sqlite_where=text("processed_at IS NULL"),
+            postgresql_where=text("processed_at IS NULL"),
+        ),
+    )
+
 
 class JobStatus(str, enum.Enum):
     PENDING = "pending"
@@ -57,7 +117,7 @@ class Job(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     kind: Mapped[str] = mapped_column(String(64), nullable=False)
-    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONType, nullable=False)
     status: Mapped[JobStatus] = mapped_column(Enum(JobStatus, name="job_status"), nullable=False)
     attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     next_run_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
@@ -73,7 +133,7 @@ class CalendarNote(Base):
     idempotency_key: Mapped[str] = mapped_column(String(128), primary_key=True)
     subject: Mapped[str] = mapped_column(String(255), nullable=False)
     when: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
-    related_ids: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
+    related_ids: Mapped[list[str]] = mapped_column(JSONType, nullable=False, default=list)
 
 
 class SessionToken(Base):
@@ -82,7 +142,7 @@ class SessionToken(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     access_token: Mapped[str] = mapped_column(Text, nullable=False)
-    scopes: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
+    scopes: Mapped[list[str]] = mapped_column(JSONType, nullable=False, default=list)
     issued_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
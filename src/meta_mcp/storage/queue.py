@@ -2,19 +2,58 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Sequence
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, bindparam, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
 
 from ..errors import McpError, McpErrorCode, MCPException
-from .db import session_scope
+from .db import transaction_scope
 from .models import WebhookEvent
 
+# Built once with bound parameters so each dequeue skips statement construction and
+# hits SQLAlchemy's compiled-statement cache. The outer processed_at re-check keeps
+# concurrent dequeuers from claiming a row twice.
+_CLAIM_UNPROCESSED = (
+    update(WebhookEvent)
+    .where(
+        WebhookEvent.id.in_(
+            select(WebhookEvent.id)
+            .where(WebhookEvent.processed_at.is_(None))
+            .order_by(WebhookEvent.delivered_at.asc())
+            .limit(bindparam("maximum"))
+            .scalar_subquery()
+        ),
+        WebhookEvent.processed_at.is_(None),
+    )
+    .values(processed_at=bindparam("now"))
+    .returning(
+        WebhookEvent.id,
+        WebhookEvent.topic,
+        WebhookEvent.object_id,
+        WebhookEvent.payload,
+        WebhookEvent.delivered_at,
+    )
+)
+
+# Claimed rows are returned in one RETURNING result, so batch size bounds peak memory.
+MAX_DEQUEUE_BATCH = 200
+
 
 class WebhookEventQueue:
-    """Persist webhook deliveries and surface them to MCP tools."""
+    """Persist webhook deliveries and surface them to MCP tools.
+
+    Deliveries are group-committed: rows recorded while a flush is in progress are
+    written together by the next flush in one multi-row INSERT, and every caller
+    returns only once its own row has been committed.
+    """
+
+    def __init__(self) -> None:
+        self._pending: list[dict[str, Any]] = []
+        self._pending_done: asyncio.Future[None] | None = None
+        self._flush_lock = asyncio.Lock()
 
     async def record_delivery(
         self,
@@ -24,16 +63,41 @@ class WebhookEventQueue:
         payload: dict[str, Any],
         delivered_at: datetime | None = None,
     ) -> None:
-        delivered = delivered_at or datetime.now(timezone.utc)
-        async with session_scope() as session:
-            session.add(
-                WebhookEvent(
-                    topic=topic,
-                    object_id=object_id,
-                    payload=payload,
-                    delivered_at=delivered,
-                )
-            )
+        self._pending.append(
+            {
+                "topic": topic,
+                "object_id": object_id,
+                "payload": payload,
+                "delivered_at": delivered_at,
+            }
+        )
+        if self._pending_done is None:
+            self._pending_done = asyncio.get_running_loop().create_future()
+        done = self._pending_done
+        async with self._flush_lock:
+            if not done.done():
+                await self._flush(done)
+        await done
+
+    async def _flush(self, done: asyncio.Future[None]) -> None:
+        batch, self._pending = self._pending, []
+        self._pending_done = None
+        if not batch:
+            done.set_result(None)
+            return
+        now = datetime.now(timezone.utc)
+        for row in batch:
+            if row["delivered_at"] is None:
+                row["delivered_at"] = now
+        try:
+            async with transaction_scope() as conn:
+                await conn.execute(insert(WebhookEvent), batch)
+        except BaseException as exc:
+            # Settle on cancellation too: co-batched callers must not see their rows
+            # as committed, and the flushing caller re-raises via ``await done``.
+            done.set_exception(exc)
+        else:
+            done.set_result(None)
 
     async def dequeue(self, *, maximum: int = 50) -> list[dict[str, Any]]:
         if maximum <= 0:
@@ -44,36 +108,44 @@ class WebhookEventQueue:
                     details={"maximum": maximum},
                 )
             )
-
-        async with session_scope() as session:
-            rows = await self._fetch_unprocessed(session=session, maximum=maximum)
-            events: list[dict[str, Any]] = []
-            now = datetime.now(timezone.utc)
-            for row in rows:
-                row.processed_at = now
-                events.append(
-                    {
-                        "id": row.id,
-                        "topic": row.topic,
-                        "object_id": row.object_id,
-                        "payload": row.payload,
-                        "delivered_at": row.delivered_at.isoformat(),
-                        "processed_at": now.isoformat(),
-                    }
+        if maximum > MAX_DEQUEUE_BATCH:
+            raise MCPException(
+                McpError(
+                    code=McpErrorCode.VALIDATION,
+                    message=f"maximum must not exceed {MAX_DEQUEUE_BATCH}",
+                    details={"maximum": maximum},
                 )
-        return events
+            )
+
+        now = datetime.now(timezone.utc)
+        processed_at = now.isoformat()
+        iso = datetime.isoformat
+        async with transaction_scope() as conn:
+            rows = await self._fetch_unprocessed(conn=conn, maximum=maximum, now=now)
+        return [
+            {
+                "id": row.id,
+                "topic": row.topic,
+                "object_id": row.object_id,
+                "payload": row.payload,
+                "delivered_at": iso(row.delivered_at),
+                "processed_at": processed_at,
+            }
+            for row in rows
+        ]
 
     async def _fetch_unprocessed(
-        self, *, session: AsyncSession, maximum: int
-    ) -> list[WebhookEvent]:
-        stmt = (
-            select(WebhookEvent)
-            .where(WebhookEvent.processed_at.is_(None))
-            .order_by(WebhookEvent.delivered_at.asc())
-            .limit(maximum)
-        )
-        result = await session.execute(stmt)
-        return list(result.scalars().all())
+        self, *, conn: AsyncConnection, maximum: int, now: datetime
+    ) -> Sequence[Row[Any]]:
+        """Claim up to ``maximum`` unprocessed events in one ``UPDATE ... RETURNING``.
+
+        Only the columns needed by :meth:`dequeue` are returned, as plain rows, so no
+        ORM instances or identity-map entries are created.
+        """
+
+        result = await conn.execute(_CLAIM_UNPROCESSED, {"maximum": maximum, "now": now})
+        # RETURNING order is unspecified, so restore delivery order here.
+        return sorted(result.all(), key=lambda row: (row.delivered_at, row.id))
 
 
-__all__ = ["WebhookEventQueue"]
+__all__ = ["MAX_DEQUEUE_BATCH", "WebhookEventQueue"]
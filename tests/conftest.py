@@ -7,48 +7,409 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
 
-try:
-    import pytest_asyncio  # type: ignore  # noqa: F401
-    pytest_plugins = ("pytest_asyncio",)
-except ModuleNotFoundError:  # pragma: no cover
-    pytest_plugins: tuple[str, ...] = tuple()
-
-import os
-from collections.abc import AsyncIterator
+import sqlite3
+import uuid
+from collections.abc import AsyncIterator, Iterator
+from contextlib import closing
+from pathlib import Path
+from types import SimpleNamespace
 
+import httpx
 import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine
+
+from mcp_meta_sdk import MetaMcpSdk
+from meta_mcp import serialization
+from meta_mcp.config import MetaMcpSettings, get_settings
+from meta_mcp.mcp_tools import auth_login, core
+from meta_mcp.mcp_tools.common import ToolEnvironment
+from meta_mcp.meta_client.auth import TokenService
+from meta_mcp.meta_client.client import MetaGraphApiClient
+from meta_mcp.storage.db import dispose_engine
+from meta_mcp.storage.models import Base
+from meta_mcp.storage.queue import WebhookEventQueue
+
+TEST_ENV = {
+    "META_MCP_GRAPH_API_BASE_URL": "https://example.com",
+    "META_MCP_APP_ID": "app",
+    "META_MCP_APP_SECRET": "secret",
+    "META_MCP_VERIFY_TOKEN": "verify",
+    "META_MCP_FACEBOOK_OAUTH_BASE_URL": "https://example.com",
+    "META_MCP_OAUTH_REDIRECT_URI": "https://client.example.com/callback",
+}
+
+
+@pytest.fixture(scope="session")
+def settings() -> MetaMcpSettings:
+    """Settings built once from ``TEST_ENV`` for tests that only need configuration values."""
+
+    return MetaMcpSettings(
+        **{key.removeprefix("META_MCP_").lower(): value for key, value in TEST_ENV.items()}
+    )
 
-from meta_mcp.config import get_settings
-from meta_mcp.storage.db import init_models
 
+@pytest.fixture(scope="session")
+def template_db(tmp_path_factory) -> Path:
+    """Build the schema once per session; tests copy it instead of re-running DDL."""
 
-@pytest.fixture(autouse=True)
-async def configure_settings(tmp_path) -> AsyncIterator[None]:
-    """Configure test database and reset cached settings."""
+    path = tmp_path_factory.mktemp("db") / "template.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return path
 
-    db_path = tmp_path / "test.db"
-    os.environ["META_MCP_DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
-    os.environ["META_MCP_GRAPH_API_BASE_URL"] = "https://example.com"
-    os.environ["META_MCP_APP_ID"] = "app"
-    os.environ["META_MCP_APP_SECRET"] = "secret"
-    os.environ["META_MCP_VERIFY_TOKEN"] = "verify"
-    os.environ["META_MCP_FACEBOOK_OAUTH_BASE_URL"] = "https://example.com"
-    os.environ["META_MCP_OAUTH_REDIRECT_URI"] = "https://client.example.com/callback"
+
+@pytest_asyncio.fixture(autouse=True)
+async def configure_settings(request, template_db, monkeypatch) -> AsyncIterator[None]:
+    """Configure test database and reset cached settings.
+
+    Each test gets its own shared-cache in-memory database seeded from the template.
+    The anchor connection keeps it alive across pool checkouts, so nothing touches disk.
+    Tests marked ``no_db`` skip the seeding and get an empty private in-memory URL.
+    """
+
+    anchor = None
+    if request.node.get_closest_marker("no_db"):
+        monkeypatch.setenv("META_MCP_DATABASE_URL", "sqlite+aiosqlite://")
+    else:
+        db_uri = f"file:meta_mcp_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        anchor = sqlite3.connect(db_uri, uri=True)
+        with closing(sqlite3.connect(template_db)) as template:
+            template.backup(anchor)
+        monkeypatch.setenv("META_MCP_DATABASE_URL", f"sqlite+aiosqlite:///{db_uri}&uri=true")
+    for key, value in TEST_ENV.items():
+        monkeypatch.setenv(key, value)
 
     get_settings.cache_clear()
     _ = get_settings()
-    await init_models()
     yield
+    await dispose_engine()
+    if anchor is not None:
+        anchor.close()
     get_settings.cache_clear()
-    os.environ.pop("META_MCP_DATABASE_URL", None)
-    os.environ.pop("META_MCP_GRAPH_API_BASE_URL", None)
-    os.environ.pop("META_MCP_APP_ID", None)
-    os.environ.pop("META_MCP_APP_SECRET", None)
-    os.environ.pop("META_MCP_VERIFY_TOKEN", None)
-    os.environ.pop("META_MCP_FACEBOOK_OAUTH_BASE_URL", None)
-    os.environ.pop("META_MCP_OAUTH_REDIRECT_URI", None)
 
 
+def _encode_once(kwargs: dict[str, object]) -> dict[str, object]:
+    """Serialise a ``json=`` payload up front so repeated hits reuse the same bytes."""
+
+    if "json" not in kwargs:
+        return kwargs
+    kwargs = dict(kwargs)
+    kwargs["content"] = serialization.dumps(kwargs.pop("json"))
+    kwargs["headers"] = {"content-type": "application/json", **dict(kwargs.get("headers") or {})}
+    return kwargs
+
+
+class GraphRouter:
+    """Answers Graph requests from a ``(method, path)`` table and records each request."""
+
+    def __init__(self) -> None:
+        self.routes: dict[tuple[str, str] | None, list[tuple[int, dict[str, object]]]] = {}
+        self.requests: list[httpx.Request] = []
+
+    def add(self, method: str, path: str, status: int, **kwargs: object) -> None:
+        self.routes[(method, path)] = [(status, _encode_once(kwargs))]
+
+    def add_sequence(self, method: str, path: str, *responses: dict[str, object]) -> None:
+        """Answer successive hits with ``responses`` (``status`` plus Response kwargs).
+
+        The last response repeats once the sequence is exhausted.
+        """
+
+        route = []
+        for response in responses:
+            kwargs = dict(response)
+            route.append((kwargs.pop("status"), _encode_once(kwargs)))
+        self.routes[(method, path)] = route
+
+    def add_default(self, status: int, **kwargs: object) -> None:
+        self.routes[None] = [(status, _encode_once(kwargs))]
+
+    def reset(self) -> None:
+        self.routes.clear()
+        self.requests.clear()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        route = self.routes.get((request.method, request.url.path)) or self.routes.get(None)
+        if route is None:
+            raise LookupError(f"unrouted Graph request: {request.method} {request.url.path}")
+        status, kwargs = route.pop(0) if len(route) > 1 else route[0]
+        return httpx.Response(status, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def graph_router() -> GraphRouter:
+    return GraphRouter()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def _module_api_client(request, settings) -> AsyncIterator[MetaGraphApiClient]:
+    """One client per module: building its httpx pool and TLS context dominates mocked tests.
+
+    Modules marked ``graph_router`` get a client on a ``MockTransport`` over the module's
+    :class:`GraphRouter` instead of a real pool intercepted by respx.
+    """
+
+    transport = None
+    if request.node.get_closest_marker("graph_router"):
+        transport = httpx.MockTransport(request.getfixturevalue("graph_router"))
+    # A private copy, so tests that adjust client settings cannot leak into the session object.
+    client = MetaGraphApiClient(settings=settings.model_copy(), transport=transport)
+    yield client
+    await client.aclose()
+
+
+class _StubServer:
+    """Stub server for registering tool handlers and custom routes in tests."""
+
+    def __init__(self) -> None:
+        self.tools: dict[str, object] = {}
+        self.routes: dict[str, object] = {}
+
+    def tool(
+        self, name: str, structured_output: bool = True, **kwargs
+    ):  # pragma: no cover - decorator wrapper
+        def decorator(fn):
+            self.tools[name] = fn
+            return fn
+
+        return decorator
+
+    def custom_route(
+        self, path: str, methods: list[str], name: str, **kwargs
+    ):  # pragma: no cover - decorator wrapper
+        def decorator(fn):
+            self.routes[name] = fn
+            return fn
+
+        return decorator
+
+
+@pytest.fixture
+def stub_server() -> _StubServer:
+    """Empty stub server; tests register the tool modules they exercise."""
+
+    return _StubServer()
+
+
+@pytest.fixture(scope="module")
+def module_stub_server() -> _StubServer:
+    """Stub server shared by a module whose tools are registered once."""
+
+    return _StubServer()
+
+
+class _StubTokenService:
+    """Grants every permission check; far cheaper to build than ``AsyncMock(spec=TokenService)``."""
+
+    def __init__(self, metadata: SimpleNamespace) -> None:
+        self.metadata = metadata
+
+    async def ensure_permissions(self, **_: object) -> SimpleNamespace:
+        return self.metadata
+
+    async def ensure_instagram_business(self, metadata: object) -> None:
+        return None
+
+    async def assert_ig_publish_allowed(self, **_: object) -> None:
+        return None
+
+
+class _StubEventQueue:
+    """Serves canned events and records deliveries in place of ``WebhookEventQueue``."""
+
+    def __init__(self) -> None:
+        self.events: list[dict[str, object]] = []
+        self.deliveries: list[dict[str, object]] = []
+
+    async def dequeue(self, *, maximum: int) -> list[dict[str, object]]:
+        return self.events[:maximum]
+
+    async def record_delivery(self, **delivery: object) -> None:
+        self.deliveries.append(delivery)
+
+
+@pytest.fixture(scope="session")
+def make_token_service():
+    """Builder for token-service stubs; keyword overrides are set on the token metadata."""
+
+    def build(*, token_type: str = "page", **metadata: object) -> _StubTokenService:
+        return _StubTokenService(
+            SimpleNamespace(subject_id="123", type=SimpleNamespace(value=token_type), **metadata)
+        )
+
+    return build
+
+
+@pytest.fixture(scope="module")
+def token_service(make_token_service) -> _StubTokenService:
+    """Page-token stub; modules needing other metadata override this fixture."""
+
+    return make_token_service()
+
+
+@pytest.fixture(scope="module")
+def event_queue() -> _StubEventQueue:
+    """Empty queue; modules override this fixture to seed ``events``."""
+
+    return _StubEventQueue()
+
+
+@pytest.fixture(scope="module")
+def tool_env(settings, _module_api_client, token_service, event_queue) -> ToolEnvironment:
+    """One environment per module around the shared client."""
+
+    return ToolEnvironment(
+        settings=settings,
+        client=_module_api_client,
+        token_service=token_service,
+        event_queue=event_queue,
+    )
+
+
+@pytest.fixture(scope="module")
+def _module_tool_server(tool_register, tool_env) -> _StubServer:
+    server = _StubServer()
+    tool_register(server, tool_env)
+    return server
+
+
+@pytest.fixture(scope="module")
+def tool_register():
+    """Overridden by each tool test module to return the ``register`` function under test."""
+
+    pytest.fail(
+        "define a module-scoped tool_register fixture returning the register function under test"
+    )
+
+
+@pytest.fixture
+def registered_tools(_module_tool_server, api_client) -> dict[str, object]:
+    """Tools from the module's ``tool_register``, registered once per module.
+
+    The shared client is reset after each test, as with ``api_client``.
+    """
+
+    return _module_tool_server.tools
+
+
+@pytest.fixture
+def registered_routes(_module_tool_server, api_client) -> dict[str, object]:
+    """Custom HTTP routes from the module's ``tool_register``, keyed by route name."""
+
+    return _module_tool_server.routes
+
+
+_UNSET = object()
+
+
+def _expect_ok(result: dict[str, object], *path: object, eq: object = _UNSET) -> object:
+    value: object = result
+    assert result["ok"] is True, result
+    for key in path:
+        value = value[key]  # type: ignore[index]
+    if eq is not _UNSET:
+        assert value == eq, f"{path}: {value!r}"
+    return value
+
+
+@pytest.fixture(scope="session")
+def expect_ok():
+    """Assert a tool result succeeded.
+
+    ``expect_ok(result, *path, eq=value)`` also checks the value at ``path``.
+    """
+
+    return _expect_ok
+
+
+@pytest.fixture
+def ctx() -> SimpleNamespace:
+    """Tool context whose request meta carries an access token."""
+
+    return SimpleNamespace(request_context=SimpleNamespace(meta={"access_token": "token123"}))
+
+
+@pytest.fixture(scope="session")
+def tool_server(
+    integration_settings: MetaMcpSettings, integration_client: MetaGraphApiClient
+) -> _StubServer:
+    """Auth and core tools registered once per session against the live integration client.
+
+    Requires the requesting module to provide session-scoped ``integration_settings``
+    and ``integration_client`` fixtures.
+    """
+
+    env = ToolEnvironment(
+        settings=integration_settings,
+        client=integration_client,
+        token_service=TokenService(integration_client),
+        event_queue=WebhookEventQueue(),
+    )
+    server = _StubServer()
+    auth_login.register(server, env)
+    core.register(server, env)
+    return server
+
+
+@pytest.fixture(scope="session")
+def _session_sdk() -> MetaMcpSdk:
+    return MetaMcpSdk(base_url="http://localhost")
+
+
+@pytest.fixture
+def shared_sdk(_session_sdk) -> Iterator[MetaMcpSdk]:
+    """One SDK per session; tests bind a stub ``_session`` and it is unbound afterwards."""
+
+    yield _session_sdk
+    _session_sdk._session = None
+
+
+async def _no_sleep(_delay: float) -> None:
+    return None
+
+
+@pytest.fixture
+def no_sleep():
+    """Sleep function to inject into clients whose tests exercise retries."""
+
+    return _no_sleep
+
+
+@pytest.fixture
+def fast_sleep(api_client, monkeypatch) -> None:
+    """Make retry backoff instant without recording mock calls."""
+
+    monkeypatch.setattr(api_client._backoff, "_sleep", _no_sleep)
+
+
+@pytest.fixture
+def api_client(_module_api_client) -> Iterator[MetaGraphApiClient]:
+    """Shared module client whose runtime state is reset after each test.
+
+    Tests that override client attributes do so with ``monkeypatch``.
+    """
+
+    client = _module_api_client
+    yield client
+    for limiter in (client._global_limiter, client._token_limiter):
+        limiter._events.clear()
+        limiter._locks.clear()
+    if client._cache is not None:
+        client._cache.clear()
+    client._batchers.clear()
+    client._inflight.clear()
+
 
 def pytest_configure(config) -> None:
     config.addinivalue_line("markers", "asyncio: mark async tests")
+    config.addinivalue_line("markers", "no_db: test never touches the database; skip seeding it")
+    config.addinivalue_line(
+        "markers", "graph_router: serve the module API client from graph_router"
+    )
+    # Registered here too so the suite runs cleanly without pytest-xdist installed.
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run the marked tests on one xdist worker"
+    )
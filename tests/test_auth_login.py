@@ -6,30 +6,15 @@ import pytest
 respx = pytest.importorskip("respx")
 
 from meta_mcp.auth import MetaOAuthClient
-from meta_mcp.config import get_settings
 from meta_mcp.mcp_tools import auth_login
 from meta_mcp.mcp_tools.common import ToolEnvironment
 from meta_mcp.meta_client import AuthLoginCompleteRequest
 from meta_mcp.meta_client.auth import TokenService
-from meta_mcp.meta_client.client import MetaGraphApiClient
 from meta_mcp.storage.queue import WebhookEventQueue
 
 
-class _StubServer:
-    def __init__(self) -> None:
-        self.tools: dict[str, object] = {}
-
-    def tool(self, name: str, structured_output: bool = True, **kwargs):  # pragma: no cover - decorator wrapper
-        def decorator(fn):
-            self.tools[name] = fn
-            return fn
-
-        return decorator
-
-
-@pytest.mark.asyncio
-async def test_build_authorization_url_includes_scopes() -> None:
-    settings = get_settings()
+@pytest.mark.no_db
+async def test_build_authorization_url_includes_scopes(settings) -> None:
     client = MetaOAuthClient(settings)
     url = client.build_authorization_url(
         scopes=["pages_manage_posts", "pages_read_engagement"],
@@ -41,14 +26,16 @@ async def test_build_authorization_url_includes_scopes() -> None:
     assert url.startswith(f"{settings.facebook_oauth_base_url.rstrip('/')}/{settings.graph_api_version}/dialog/oauth")
 
 
-@pytest.mark.asyncio
 @respx.mock
-async def test_login_complete_flow() -> None:
-    settings = get_settings()
-    server = _StubServer()
-    client = MetaGraphApiClient()
-    token_service = TokenService(client)
-    env = ToolEnvironment(settings=settings, client=client, token_service=token_service, event_queue=WebhookEventQueue())
+async def test_login_complete_flow(settings, stub_server, api_client) -> None:
+    server = stub_server
+    token_service = TokenService(api_client)
+    env = ToolEnvironment(
+        settings=settings,
+        client=api_client,
+        token_service=token_service,
+        event_queue=WebhookEventQueue(),
+    )
     auth_login.register(server, env)
 
     respx.get(f"{settings.graph_api_base_url}/{settings.graph_api_version}/oauth/access_token").mock(
@@ -79,5 +66,3 @@ async def test_login_complete_flow() -> None:
     assert result["ok"] is True
     assert result["data"]["access_token"] == "token123"
     assert result["meta"]["token_subject_id"] == "123"
-
-    await client.aclose()
@@ -1,19 +1,18 @@
-from unittest.mock import AsyncMock
+import asyncio
 
 import httpx
 import pytest
 
+from meta_mcp import serialization
 from meta_mcp.errors import McpErrorCode, MCPException
-from meta_mcp.meta_client.client import MetaGraphApiClient
+
+pytestmark = pytest.mark.no_db
 
 
 @pytest.fixture
-async def client():
-    c = MetaGraphApiClient()
-    yield c
-    await c.aclose()
+def client(api_client):
+    return api_client
 
-@pytest.mark.asyncio
 async def test_request_success(client, respx_mock):
     respx_mock.get("https://example.com/me").mock(
         return_value=httpx.Response(200, json={"id": "123"}, headers={"x-app-usage": "10%"})
@@ -23,8 +22,7 @@ async def test_request_success(client, respx_mock):
     assert resp.status_code == 200
     assert resp.json()["id"] == "123"
 
-@pytest.mark.asyncio
-async def test_request_retry_on_500(client, respx_mock):
+async def test_request_retry_on_500(client, respx_mock, fast_sleep):
     # Fail twice with 500, then succeed
     route = respx_mock.get("https://example.com/me")
     route.side_effect = [
@@ -33,27 +31,20 @@ async def test_request_retry_on_500(client, respx_mock):
         httpx.Response(200, json={"ok": True})
     ]
     
-    # Speed up backoff
-    client._backoff.sleep = AsyncMock()
-    
     resp = await client.request(access_token="tok", method="GET", path="/me")
     assert resp.status_code == 200
     assert route.call_count == 3
 
-@pytest.mark.asyncio
-async def test_request_retry_exhausted(client, respx_mock):
+async def test_request_retry_exhausted(client, respx_mock, fast_sleep):
     respx_mock.get("https://example.com/me").mock(
         return_value=httpx.Response(500)
     )
-    client._backoff.sleep = AsyncMock()
-    
     with pytest.raises(MCPException) as exc:
         await client.request(access_token="tok", method="GET", path="/me")
     
     assert exc.value.error.code == McpErrorCode.REMOTE_5XX
 
-@pytest.mark.asyncio
-async def test_request_rate_limit(client, respx_mock):
+async def test_request_rate_limit(client, respx_mock, fast_sleep):
     # 429 then success
     route = respx_mock.get("https://example.com/me")
     route.side_effect = [
@@ -61,13 +52,10 @@ async def test_request_rate_limit(client, respx_mock):
         httpx.Response(200, json={"ok": True})
     ]
     
-    client._backoff.sleep = AsyncMock()
-    
     resp = await client.request(access_token="tok", method="GET", path="/me")
     assert resp.status_code == 200
     assert route.call_count == 2
 
-@pytest.mark.asyncio
 async def test_error_mapping_auth(client, respx_mock):
     respx_mock.get("https://example.com/me").mock(
         return_value=httpx.Response(401, json={"error": {"message": "Bad token", "code": 190}})
@@ -78,7 +66,6 @@ async def test_error_mapping_auth(client, respx_mock):
     
     assert exc.value.error.code == McpErrorCode.AUTH
 
-@pytest.mark.asyncio
 async def test_error_mapping_permission(client, respx_mock):
     respx_mock.get("https://example.com/me").mock(
         return_value=httpx.Response(403, json={"error": {"message": "No perm", "code": 200}})
@@ -89,7 +76,6 @@ async def test_error_mapping_permission(client, respx_mock):
     
     assert exc.value.error.code == McpErrorCode.PERMISSION
 
-@pytest.mark.asyncio
 async def test_batch_request(client, respx_mock):
     respx_mock.post("https://example.com/v18.0/batch").mock(
         return_value=httpx.Response(200, json=[{"code": 200, "body": "{}"}])
@@ -99,7 +85,6 @@ async def test_batch_request(client, respx_mock):
     assert len(results) == 1
     assert results[0]["code"] == 200
 
-@pytest.mark.asyncio
 async def test_paginate(client, respx_mock):
     # First page
     respx_mock.get("https://example.com/me/feed").mock(side_effect=[
@@ -121,7 +106,6 @@ async def test_paginate(client, respx_mock):
     assert items[0]["id"] == "1"
     assert items[1]["id"] == "2"
 
-@pytest.mark.asyncio
 async def test_debug_token(client, respx_mock):
     respx_mock.get("https://example.com/v18.0/debug_token").mock(
         return_value=httpx.Response(200, json={"data": {"is_valid": True, "app_id": "123"}})
@@ -130,3 +114,144 @@ async def test_debug_token(client, respx_mock):
     result = await client.debug_token(access_token="tok")
     assert result["is_valid"] is True
     assert result["app_id"] == "123"
+
+async def test_concurrent_gets_are_coalesced_into_batch(client, respx_mock, monkeypatch):
+    monkeypatch.setattr(client, "_batch_window", 0.01)
+    batch_route = respx_mock.post("https://example.com/v18.0/batch").mock(
+        return_value=httpx.Response(
+            200,
+            json=[
+                {
+                    "code": 200,
+                    "headers": [{"name": "Content-Type", "value": "application/json"}],
+                    "body": '{"id": "1"}',
+                },
+                {"code": 200, "headers": [], "body": '{"id": "2"}'},
+            ],
+        )
+    )
+
+    first, second = await asyncio.gather(
+        client.request(access_token="tok", method="GET", path="/v18.0/1", query={"fields": "id"}),
+        client.request(access_token="tok", method="GET", path="/v18.0/2"),
+    )
+    assert first.json() == {"id": "1"}
+    assert second.json() == {"id": "2"}
+    assert batch_route.call_count == 1
+    operations = serialization.loads(batch_route.calls.last.request.content)["batch"]
+    assert operations == [
+        {"method": "GET", "relative_url": "v18.0/1?fields=id"},
+        {"method": "GET", "relative_url": "v18.0/2"},
+    ]
+
+async def test_batched_gets_take_one_limiter_slot_each(client, respx_mock, monkeypatch):
+    monkeypatch.setattr(client, "_batch_window", 0.01)
+    respx_mock.post("https://example.com/v18.0/batch").mock(
+        return_value=httpx.Response(
+            200, json=[{"code": 200, "headers": [], "body": "{}"} for _ in range(3)]
+        )
+    )
+
+    await asyncio.gather(
+        *(client.request(access_token="tok", method="GET", path=f"/v18.0/{i}") for i in range(3))
+    )
+    assert len(client._global_limiter._events["global"]) == 3
+    assert len(client._token_limiter._events[client._hash_token("tok")]) == 3
+
+async def test_lone_get_bypasses_batch(client, respx_mock, monkeypatch):
+    monkeypatch.setattr(client, "_batch_window", 0.01)
+    route = respx_mock.get("https://example.com/me").mock(
+        return_value=httpx.Response(200, json={"id": "123"})
+    )
+
+    resp = await client.request(access_token="tok", method="GET", path="/me")
+    assert resp.json()["id"] == "123"
+    assert route.call_count == 1
+
+async def test_paginate_prefetches_next_page(client, respx_mock):
+    route = respx_mock.get("https://example.com/me/feed").mock(side_effect=[
+        httpx.Response(200, json={"data": [{"id": "1"}], "paging": {"cursors": {"after": "abc"}}}),
+        httpx.Response(200, json={"data": [{"id": "2"}], "paging": {}}),
+    ])
+
+    pages = client.paginate(access_token="tok", method="GET", path="/me/feed")
+    first = await pages.__anext__()
+    assert first["data"][0]["id"] == "1"
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert route.call_count == 2
+    assert route.calls.last.request.url.params["after"] == "abc"
+    await pages.aclose()
+
+async def test_request_json_serves_cached_payload(client, respx_mock):
+    route = respx_mock.get("https://example.com/me").mock(
+        return_value=httpx.Response(200, json={"id": "123"})
+    )
+
+    first = await client.request_json(access_token="tok", method="GET", path="/me", use_cache=True)
+    second = await client.request_json(access_token="tok", method="GET", path="/me", use_cache=True)
+    assert first == {"id": "123"}
+    assert second is first
+    assert route.call_count == 1
+
+
+async def test_request_with_json_shares_decoded_body(client, respx_mock):
+    respx_mock.get("https://example.com/me").mock(
+        return_value=httpx.Response(200, json={"id": "123"})
+    )
+    respx_mock.get("https://example.com/raw").mock(return_value=httpx.Response(200, text="ok"))
+
+    response, first = await client.request_with_json(
+        access_token="tok", method="GET", path="/me", use_cache=True
+    )
+    cached_response, second = await client.request_with_json(
+        access_token="tok", method="GET", path="/me", use_cache=True
+    )
+    assert response.status_code == cached_response.status_code == 200
+    assert first == {"id": "123"}
+    assert second is first
+
+    raw_response, raw = await client.request_with_json(
+        access_token="tok", method="GET", path="/raw"
+    )
+    assert raw is None
+    assert raw_response.text == "ok"
+
+
+async def test_concurrent_identical_gets_share_one_request(client, respx_mock):
+    async def slow_response(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"id": "123"})
+
+    route = respx_mock.get("https://example.com/me").mock(side_effect=slow_response)
+
+    first, second = await asyncio.gather(
+        client.request(access_token="tok", method="GET", path="/me"),
+        client.request_json(access_token="tok", method="GET", path="/me"),
+    )
+    assert first.json() == second == {"id": "123"}
+    assert route.call_count == 1
+    assert client._inflight == {}
+
+    await client.request(access_token="other", method="GET", path="/me")
+    assert route.call_count == 2
+
+
+async def test_caller_after_single_flight_completes_fetches_again(client, respx_mock):
+    finished = asyncio.Event()
+
+    def respond(request):
+        finished.set()
+        return httpx.Response(200, json={"id": "123"})
+
+    route = respx_mock.get("https://example.com/me").mock(side_effect=respond)
+
+    async def late_caller():
+        # Wakes in the same loop iteration that completes the first request.
+        await finished.wait()
+        return await client.request(access_token="tok", method="GET", path="/me")
+
+    late = asyncio.create_task(late_caller())
+    await client.request(access_token="tok", method="GET", path="/me")
+    await late
+    assert route.call_count == 2
@@ -1,45 +1,95 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import gzip
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
+from cachetools import LRUCache
 
 from meta_mcp.errors import MCPException
-from meta_mcp.meta_client.client import MetaGraphApiClient
+from meta_mcp.meta_client import client as client_module
+from meta_mcp.meta_client.client import (
+    BackoffStrategy,
+    MetaGraphApiClient,
+    SlidingWindowRateLimiter,
+    _auth_headers,
+    _freeze,
+)
+
+pytestmark = pytest.mark.no_db
 
 
 @pytest.fixture
-async def client():
-    c = MetaGraphApiClient()
-    yield c
-    await c.aclose()
+def client(api_client):
+    return api_client
 
-@pytest.mark.asyncio
 async def test_batch_validation(client):
     with pytest.raises(MCPException):
         await client.batch(access_token="tok", operations=[{}] * 51)
 
-@pytest.mark.asyncio
-async def test_cache_hit(client):
+async def test_cache_hit(client, monkeypatch):
     # Enable cache
-    client.settings.cache_maxsize = 100
-    from cachetools import LRUCache
-    client._cache = LRUCache(maxsize=100)
+    enabled = client.settings.model_copy(update={"cache_maxsize": 100})
+    monkeypatch.setattr(client, "settings", enabled)
+    monkeypatch.setattr(client, "_cache", LRUCache(maxsize=100))
     
     key = client._cache_key(method="GET", path="/me", query=None, json_body=None)
-    client._cache[key] = {"status": 200, "headers": {}, "json": {"cached": True}}
+    client._cache[(client._hash_token("tok"), key)] = {
+        "status": 200,
+        "headers": {},
+        "json": {"cached": True},
+        "content": b'{"cached": true}',
+        "request": httpx.Request("GET", "https://example.com/me"),
+    }
     
     resp = await client.request(access_token="tok", method="GET", path="/me", use_cache=True)
     assert resp.json()["cached"] is True
 
-@pytest.mark.asyncio
-async def test_retry_after_parsing_error(client):
-    # Mock _respect_retry_after calling sleep
-    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-        resp = MagicMock()
-        resp.headers = {"Retry-After": "invalid"}
-        await client._respect_retry_after(resp)
-        mock_sleep.assert_awaited_with(0.0)
+async def test_retry_after_parsing_error(client, monkeypatch):
+    mock_sleep = AsyncMock()
+    monkeypatch.setattr(client._backoff, "_sleep", mock_sleep)
+    resp = MagicMock()
+    resp.headers = {"Retry-After": "invalid"}
+    assert await client._respect_retry_after(resp) is False
+    mock_sleep.assert_not_awaited()
+
+async def test_retry_after_http_date(client, monkeypatch):
+    mock_sleep = AsyncMock()
+    monkeypatch.setattr(client._backoff, "_sleep", mock_sleep)
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    resp = httpx.Response(429, headers={"Retry-After": format_datetime(retry_at, usegmt=True)})
+
+    assert await client._respect_retry_after(resp) is True
+    delay = mock_sleep.await_args.args[0]
+    assert 28 < delay <= 30
+    assert 28 < client._map_error(resp).error.retry_after <= 30
+
+async def test_retry_after_wait_is_capped(client, monkeypatch):
+    mock_sleep = AsyncMock()
+    monkeypatch.setattr(client._backoff, "_sleep", mock_sleep)
+    retry_at = datetime.now(timezone.utc) + timedelta(days=1)
+    resp = httpx.Response(429, headers={"Retry-After": format_datetime(retry_at, usegmt=True)})
+
+    assert await client._respect_retry_after(resp) is True
+    mock_sleep.assert_awaited_once_with(client.settings.retry_after_max_seconds)
+
+async def test_retry_after_skips_backoff(settings, respx_mock):
+    route = respx_mock.get("https://example.com/me")
+    route.side_effect = [
+        httpx.Response(429, headers={"Retry-After": "0.01"}),
+        httpx.Response(200, json={"ok": True}),
+    ]
+    sleep = AsyncMock()
+
+    async with MetaGraphApiClient(settings=settings, sleep=sleep) as client:
+        resp = await client.request(access_token="tok", method="GET", path="/me")
+    assert resp.status_code == 200
+    # Only the server-requested wait; no jittered backoff on top of it.
+    sleep.assert_awaited_once_with(0.01)
 
-@pytest.mark.asyncio
 async def test_map_error_complex(client):
     resp = MagicMock()
     resp.status_code = 400
@@ -63,3 +113,191 @@ async def test_map_error_complex(client):
     assert details["error_subcode"] == 33
     assert details["user_title"] == "Title"
     assert details["user_message"] == "User Msg"
+
+async def test_cache_hit_with_tuple_key(client, monkeypatch):
+    monkeypatch.setattr(client, "_cache", LRUCache(maxsize=100))
+
+    key = ("/me", (("limit", 5),))
+    client._cache[(client._hash_token("tok"), key)] = {
+        "status": 200,
+        "headers": {},
+        "json": {"cached": True},
+        "content": b'{"cached": true}',
+        "request": httpx.Request("GET", "https://example.com/me"),
+    }
+
+    resp = await client.request(
+        access_token="tok",
+        method="GET",
+        path="/me",
+        query={"limit": 5},
+        use_cache=True,
+        cache_key=key,
+    )
+    assert resp.json()["cached"] is True
+
+async def test_rate_limiter_waiter_does_not_block_other_keys():
+    limiter = SlidingWindowRateLimiter(capacity=1, window_seconds=0.2)
+    await limiter.acquire("a")
+    waiter = asyncio.create_task(limiter.acquire("a"))
+    await asyncio.sleep(0)
+    await asyncio.wait_for(limiter.acquire("b"), timeout=0.05)
+    assert not waiter.done()
+    await waiter
+
+
+def test_rate_limiter_fast_path_does_not_suspend():
+    limiter = SlidingWindowRateLimiter(capacity=2)
+    for _ in range(2):
+        coro = limiter.acquire("k")
+        with pytest.raises(StopIteration):
+            coro.send(None)
+    assert limiter._try_acquire("k") > 0
+
+
+def test_rate_limiter_ring_is_bounded_and_expires():
+    limiter = SlidingWindowRateLimiter(capacity=3, window_seconds=0.0)
+    for _ in range(10):
+        assert limiter._try_acquire("k") == 0.0
+    assert limiter._events["k"].maxlen == 3
+    assert len(limiter._events["k"]) == 3
+
+
+async def test_rate_limiter_waiters_queue_per_key():
+    limiter = SlidingWindowRateLimiter(capacity=1, window_seconds=0.05)
+    await limiter.acquire("a")
+    await limiter.acquire("b")
+    first = asyncio.create_task(limiter.acquire("a"))
+    second = asyncio.create_task(limiter.acquire("a"))
+    await asyncio.sleep(0)
+    assert limiter._locks["a"].locked()
+    assert not limiter._locks["b"].locked()
+    await asyncio.gather(first, second)
+
+
+async def test_rate_limiter_freed_slot_goes_to_queued_waiter(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(client_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    limiter = SlidingWindowRateLimiter(capacity=1, window_seconds=60.0)
+    await limiter.acquire("a")
+    waiter = asyncio.create_task(limiter.acquire("a"))
+    await asyncio.sleep(0)
+
+    now[0] = 61.0  # the slot frees up while the waiter is still asleep
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(limiter.acquire("a"), timeout=0.05)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter._waiting["a"] == 0
+
+
+async def test_backoff_full_jitter_stays_within_cap():
+    delays: list[float] = []
+
+    async def record(delay: float) -> None:
+        delays.append(delay)
+
+    backoff = BackoffStrategy(factor=0.5, maximum=3.0, sleep=record)
+    for attempt in range(6):
+        await backoff.sleep(attempt)
+    caps = [min(3.0, (2**attempt) * 0.5) for attempt in range(6)]
+    assert len(delays) == 6
+    assert all(0 <= delay <= cap for delay, cap in zip(delays, caps, strict=True))
+
+
+def test_cache_key_is_order_insensitive_and_hashable(client):
+    first = client._cache_key(
+        "GET", "/x", {"b": 1, "time_range": {"since": "a", "until": "b"}}, None
+    )
+    second = client._cache_key(
+        "GET", "/x", {"time_range": {"until": "b", "since": "a"}, "b": 1}, None
+    )
+    assert first == second
+    assert hash(first) == hash(second)
+    assert client._cache_key("GET", "/x", {"b": 2}, None) != client._cache_key(
+        "GET", "/x", {"b": 1}, None
+    )
+
+
+def test_flat_query_cache_key_matches_frozen_key(client):
+    query = {"fields": "id,name", "limit": 25}
+    assert client._cache_key("GET", "/x", query, None) == ("GET", "/x", _freeze(query), ())
+
+
+async def test_cache_hit_skips_rate_limiters(client, respx_mock, monkeypatch):
+    respx_mock.get("https://example.com/me").mock(
+        return_value=httpx.Response(200, json={"id": "1"})
+    )
+    await client.request(access_token="tok", method="GET", path="/me", use_cache=True)
+
+    global_acquire, token_acquire = AsyncMock(), AsyncMock()
+    monkeypatch.setattr(client._global_limiter, "acquire", global_acquire)
+    monkeypatch.setattr(client._token_limiter, "acquire", token_acquire)
+    await client.request(access_token="tok", method="GET", path="/me", use_cache=True)
+    global_acquire.assert_not_awaited()
+    token_acquire.assert_not_awaited()
+
+
+async def test_cache_is_scoped_per_token(client, respx_mock):
+    route = respx_mock.get("https://example.com/me").mock(
+        side_effect=[httpx.Response(200, json={"who": "a"}), httpx.Response(200, json={"who": "b"})]
+    )
+
+    first = await client.request(access_token="tok-a", method="GET", path="/me", use_cache=True)
+    second = await client.request(access_token="tok-b", method="GET", path="/me", use_cache=True)
+    again = await client.request(access_token="tok-a", method="GET", path="/me", use_cache=True)
+    assert (first.json()["who"], second.json()["who"], again.json()["who"]) == ("a", "b", "a")
+    assert route.call_count == 2
+
+async def test_auth_headers_reused_and_extended_with_idempotency(client, respx_mock):
+    route = respx_mock.post("https://example.com/me").mock(
+        return_value=httpx.Response(200, json={})
+    )
+    await client.request(
+        access_token="tok", method="POST", path="/me", json_body={}, idempotency_key="abc"
+    )
+
+    request = route.calls.last.request
+    assert request.headers["Authorization"] == "Bearer tok"
+    assert request.headers["Idempotency-Key"] == "abc"
+    assert _auth_headers("tok") is _auth_headers("tok")
+    assert len(_auth_headers("tok")) == 1
+
+async def test_cached_response_replays_original_body(client, respx_mock):
+    route = respx_mock.get("https://example.com/me").mock(
+        return_value=httpx.Response(
+            200,
+            content=gzip.compress(b'{"id": "1"}'),
+            headers={
+                "Content-Encoding": "gzip",
+                "Content-Type": "application/json",
+                "x-app-usage": "5%",
+            },
+        )
+    )
+
+    first = await client.request(access_token="tok", method="GET", path="/me", use_cache=True)
+    second = await client.request(access_token="tok", method="GET", path="/me", use_cache=True)
+    assert route.call_count == 1
+    assert second.content == first.content == b'{"id": "1"}'
+    assert second.headers["x-app-usage"] == "5%"
+    assert second.request is first.request
+
+
+def test_settings_override_refreshes_derived_values(client, monkeypatch):
+    overridden = client.settings.model_copy(update={"graph_api_version": "v21.0", "max_retries": 1})
+    monkeypatch.setattr(client, "settings", overridden)
+    assert client._batch_path == "/v21.0/batch"
+    assert client._debug_token_path == "/v21.0/debug_token"
+    assert client._max_retries == 1
+
+
+def test_map_error_non_json_body(client):
+    resp = httpx.Response(
+        502, text="Bad Gateway", headers={"x-app-usage": "99%", "Retry-After": "2"}
+    )
+    exc = client._map_error(resp)
+    assert exc.error.message == "Bad Gateway"
+    assert exc.error.retry_after == 2.0
+    assert exc.error.details["meta"] == {"x-app-usage": "99%"}
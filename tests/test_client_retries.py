@@ -5,17 +5,18 @@ import pytest
 
 respx = pytest.importorskip("respx")
 
-from meta_mcp.config import get_settings
 from meta_mcp.errors import McpErrorCode, MCPException
-from meta_mcp.meta_client.client import MetaGraphApiClient
+
+pytestmark = pytest.mark.no_db
 
 
-@pytest.mark.asyncio
 @respx.mock
-async def test_request_retries_on_500(monkeypatch) -> None:
-    monkeypatch.setenv("META_MCP_MAX_RETRIES", "1")
-    monkeypatch.setenv("META_MCP_GRAPH_API_VERSION", "v1.0")
-    get_settings.cache_clear()
+async def test_request_retries_on_500(settings, api_client, fast_sleep, monkeypatch) -> None:
+    monkeypatch.setattr(
+        api_client,
+        "settings",
+        settings.model_copy(update={"max_retries": 1, "graph_api_version": "v1.0"}),
+    )
 
     route = respx.get("https://example.com/v1.0/test").mock(
         side_effect=[
@@ -24,20 +25,19 @@ async def test_request_retries_on_500(monkeypatch) -> None:
         ]
     )
 
-    client = MetaGraphApiClient()
-    response = await client.request(access_token="token", method="GET", path="/v1.0/test")
-    await client.aclose()
+    response = await api_client.request(access_token="token", method="GET", path="/v1.0/test")
 
     assert response.json()["success"] is True
     assert route.call_count == 2
 
 
-@pytest.mark.asyncio
 @respx.mock
-async def test_request_maps_permission_errors(monkeypatch) -> None:
-    monkeypatch.setenv("META_MCP_MAX_RETRIES", "0")
-    monkeypatch.setenv("META_MCP_GRAPH_API_VERSION", "v1.0")
-    get_settings.cache_clear()
+async def test_request_maps_permission_errors(settings, api_client, monkeypatch) -> None:
+    monkeypatch.setattr(
+        api_client,
+        "settings",
+        settings.model_copy(update={"max_retries": 0, "graph_api_version": "v1.0"}),
+    )
 
     respx.get("https://example.com/v1.0/test").mock(
         return_value=httpx.Response(
@@ -46,9 +46,31 @@ async def test_request_maps_permission_errors(monkeypatch) -> None:
         )
     )
 
-    client = MetaGraphApiClient()
     with pytest.raises(MCPException) as exc:
-        await client.request(access_token="token", method="GET", path="/v1.0/test")
-    await client.aclose()
+        await api_client.request(access_token="token", method="GET", path="/v1.0/test")
 
     assert exc.value.error.code == McpErrorCode.PERMISSION
+
+
+@respx.mock
+async def test_request_does_not_repeat_transport_connect_retries(
+    settings, api_client, fast_sleep, monkeypatch
+) -> None:
+    monkeypatch.setattr(
+        api_client,
+        "settings",
+        settings.model_copy(update={"max_retries": 2, "graph_api_version": "v1.0"}),
+    )
+
+    connect = respx.get("https://example.com/v1.0/connect").mock(
+        side_effect=httpx.ConnectError("refused")
+    )
+    read = respx.get("https://example.com/v1.0/read").mock(side_effect=httpx.ReadTimeout("slow"))
+
+    for path in ("/v1.0/connect", "/v1.0/read"):
+        with pytest.raises(MCPException) as exc:
+            await api_client.request(access_token="token", method="GET", path=path)
+        assert exc.value.error.code == McpErrorCode.REMOTE_5XX
+
+    assert connect.call_count == 1
+    assert read.call_count == 3
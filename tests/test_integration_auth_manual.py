@@ -67,25 +67,26 @@ This test validates the complete OAuth flow against the LIVE Meta API:
 
 from __future__ import annotations
 
+import functools
 import os
 from collections.abc import AsyncIterator
 from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
 
 import pytest
-from sqlalchemy import select
+import pytest_asyncio
+from sqlalchemy import delete, select
 
 from meta_mcp.config import MetaMcpSettings, get_settings
-from meta_mcp.mcp_tools import auth_login, core
 from meta_mcp.mcp_tools.common import ToolEnvironment
 from meta_mcp.meta_client import (
     AuthLoginBeginRequest,
     AuthLoginCompleteRequest,
-    GraphRequestInput,
 )
 from meta_mcp.meta_client.auth import TokenService
 from meta_mcp.meta_client.client import MetaGraphApiClient
 from meta_mcp.storage import Token
-from meta_mcp.storage.db import init_models, session_scope
+from meta_mcp.storage.db import dispose_engine, init_models, session_scope
 from meta_mcp.storage.queue import WebhookEventQueue
 
 # Skip these tests by default unless explicitly enabled
@@ -95,37 +96,35 @@ pytestmark = pytest.mark.skipif(
 )
 
 
-class _StubServer:
-    """Stub server for registering tool handlers in tests."""
+@functools.lru_cache(maxsize=1)
+def _integration_creds() -> tuple[str | None, str | None, str, str]:
+    """Integration credentials as ``(app_id, app_secret, redirect_uri, verify_token)``.
 
-    def __init__(self) -> None:
-        self.tools: dict[str, object] = {}
-
-    def tool(self, name: str, structured_output: bool = True):
-        def decorator(fn):
-            self.tools[name] = fn
-            return fn
-
-        return decorator
+    Read once per session.
+    """
+    return (
+        os.environ.get("META_MCP_APP_ID"),
+        os.environ.get("META_MCP_APP_SECRET"),
+        os.environ.get("META_MCP_OAUTH_REDIRECT_URI", "http://localhost:8000/oauth/callback"),
+        os.environ.get("META_MCP_VERIFY_TOKEN", "test_verify_token"),
+    )
 
 
-@pytest.fixture
-async def integration_settings(tmp_path) -> AsyncIterator[MetaMcpSettings]:
+@pytest_asyncio.fixture(scope="session")
+async def integration_settings(tmp_path_factory) -> AsyncIterator[MetaMcpSettings]:
     """Create settings using real Meta app credentials from environment.
     
-    This fixture loads actual credentials but uses a temporary test database.
+    This fixture loads actual credentials but uses a temporary test database,
+    created once per session; ``_clean_db`` empties it between tests.
     """
     # Load from environment or .env.integration file
-    app_id = os.environ.get("META_MCP_APP_ID")
-    app_secret = os.environ.get("META_MCP_APP_SECRET")
-    redirect_uri = os.environ.get("META_MCP_OAUTH_REDIRECT_URI", "http://localhost:8000/oauth/callback")
-    verify_token = os.environ.get("META_MCP_VERIFY_TOKEN", "test_verify_token")
+    app_id, app_secret, redirect_uri, verify_token = _integration_creds()
     
     if not app_id or not app_secret:
         pytest.skip("META_MCP_APP_ID and META_MCP_APP_SECRET must be set for integration tests")
     
     # Use temporary database for testing
-    db_path = tmp_path / "integration_test.db"
+    db_path = tmp_path_factory.mktemp("integration", numbered=False) / "integration_test.db"
     
     settings = MetaMcpSettings(
         app_id=app_id,
@@ -140,42 +139,53 @@ async def integration_settings(tmp_path) -> AsyncIterator[MetaMcpSettings]:
         default_timeout_seconds=30.0,
     )
     
-    # Override global settings for this test
-    os.environ["META_MCP_DATABASE_URL"] = str(settings.database_url)
+    # Initialize the database once; drop the engine so each test rebuilds it from its own settings
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("META_MCP_DATABASE_URL", str(settings.database_url))
+        get_settings.cache_clear()
+        await init_models()
+        await dispose_engine()
     get_settings.cache_clear()
     
-    # Initialize database
-    await init_models()
-    
     yield settings
-    
-    # Cleanup
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _clean_db(configure_settings, integration_settings: MetaMcpSettings, monkeypatch) -> None:
+    """Point each test at the session database and empty the token table."""
+    monkeypatch.setenv("META_MCP_DATABASE_URL", str(integration_settings.database_url))
     get_settings.cache_clear()
-    os.environ.pop("META_MCP_DATABASE_URL", None)
+    async with session_scope() as session:
+        await session.execute(delete(Token))
 
 
-@pytest.fixture
-async def integration_env(integration_settings: MetaMcpSettings) -> AsyncIterator[ToolEnvironment]:
-    """Create a complete tool environment for integration testing."""
-    client = MetaGraphApiClient()
-    token_service = TokenService(client)
-    event_queue = WebhookEventQueue()
-    
-    env = ToolEnvironment(
-        settings=integration_settings,
-        client=client,
-        token_service=token_service,
-        event_queue=event_queue,
-    )
+@pytest_asyncio.fixture(scope="session")
+async def integration_client(
+    integration_settings: MetaMcpSettings,
+) -> AsyncIterator[MetaGraphApiClient]:
+    """One Graph API client per session; also backs the shared ``tool_server``."""
+    client = MetaGraphApiClient(settings=integration_settings)
     
-    yield env
+    yield client
     
     # Cleanup
     await client.aclose()
 
 
-@pytest.mark.asyncio
-async def test_generate_authorization_url(integration_env: ToolEnvironment) -> None:
+@pytest.fixture(scope="session")
+def integration_env(
+    integration_settings: MetaMcpSettings, integration_client: MetaGraphApiClient
+) -> ToolEnvironment:
+    """Create a complete tool environment for integration testing, shared by the whole session."""
+    return ToolEnvironment(
+        settings=integration_settings,
+        client=integration_client,
+        token_service=TokenService(integration_client),
+        event_queue=WebhookEventQueue(),
+    )
+
+
+async def test_generate_authorization_url(integration_env: ToolEnvironment, tool_server) -> None:
     """Generate an authorization URL for manual testing.
     
     Run this test to get the URL you need to visit to obtain an authorization code:
@@ -184,8 +194,7 @@ async def test_generate_authorization_url(integration_env: ToolEnvironment) -> N
     
     The URL will be printed to stdout. Visit it in your browser to grant permissions.
     """
-    server = _StubServer()
-    auth_login.register(server, integration_env)
+    server = tool_server
     
     # Request common permissions for testing
     request = AuthLoginBeginRequest(
@@ -217,14 +226,18 @@ async def test_generate_authorization_url(integration_env: ToolEnvironment) -> N
     print("=" * 80)
     
     # Verify URL structure
-    assert integration_env.settings.facebook_oauth_base_url in auth_url
-    assert str(integration_env.settings.app_id) in auth_url
-    assert "pages_manage_posts" in auth_url
-    assert state in auth_url
+    parts = urlsplit(auth_url)
+    query = parse_qs(parts.query)
+    assert (
+        f"{parts.scheme}://{parts.netloc}"
+        == integration_env.settings.facebook_oauth_base_url.rstrip("/")
+    )
+    assert query["client_id"][0] == str(integration_env.settings.app_id)
+    assert "pages_manage_posts" in query["scope"][0].split(",")
+    assert query["state"][0] == state
 
 
-@pytest.mark.asyncio
-async def test_oauth_login_integration(integration_env: ToolEnvironment) -> None:
+async def test_oauth_login_integration(integration_env: ToolEnvironment, tool_server) -> None:
     """Test the complete OAuth login flow with a real authorization code.
     
     This test performs REAL API calls to Meta's servers.
@@ -255,10 +268,8 @@ async def test_oauth_login_integration(integration_env: ToolEnvironment) -> None
     print(f"Using auth code: {auth_code[:10]}...")
     print(f"{'=' * 80}\n")
     
-    # Set up tool server
-    server = _StubServer()
-    auth_login.register(server, integration_env)
-    core.register(server, integration_env)
+    # Tool server with auth and core tools registered once per session
+    server = tool_server
     
     # Step 1: Complete OAuth flow with real authorization code
     print("Step 1: Exchanging authorization code for access token...")
@@ -312,27 +323,6 @@ async def test_oauth_login_integration(integration_env: ToolEnvironment) -> None
     # Step 3: Use the token to make a real API call
     print("\nStep 3: Testing token with real API call to /me...")
     
-    # Use the graph.request tool to call /me
-    graph_request = GraphRequestInput(
-        method="GET",
-        path=f"/{integration_env.settings.graph_api_version}/me",
-        query={"fields": "id,name"},
-    )
-    
-    # Create a mock context with the access token
-    class _MockContext:
-        class _RequestContext:
-            class _Request:
-                class _Params:
-                    arguments = {}
-                params = _Params()
-            request = _Request()
-            meta = None
-        request_context = _RequestContext()
-    
-    # We need to pass the token through the context - let's do it via arguments instead
-    graph_request_dict = graph_request.model_dump()
-    
     # For this test, we'll use the client directly since we have the token
     print("   Making API call to /me endpoint...")
     response = await integration_env.client.request(
@@ -358,8 +348,9 @@ async def test_oauth_login_integration(integration_env: ToolEnvironment) -> None
     print(f"{'=' * 80}\n")
 
 
-@pytest.mark.asyncio
-async def test_token_validation_with_real_api(integration_env: ToolEnvironment) -> None:
+async def test_token_validation_with_real_api(
+    integration_env: ToolEnvironment, tool_server
+) -> None:
     """Test token validation against real Meta API.
     
     This test can use either:
@@ -377,8 +368,7 @@ async def test_token_validation_with_real_api(integration_env: ToolEnvironment)
             "Either INTEGRATION_TEST_AUTH_CODE or INTEGRATION_TEST_ACCESS_TOKEN must be set"
         )
     
-    server = _StubServer()
-    auth_login.register(server, integration_env)
+    server = tool_server
     
     # If we have a code, exchange it for a token first
     if auth_code and not access_token:
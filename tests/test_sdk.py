@@ -6,44 +6,58 @@ from typing import Any
 import pytest
 from mcp import types
 
-from mcp_meta_sdk import MetaMcpSdk, ToolExecutionError, ToolResponseError
+from mcp_meta_sdk import ToolExecutionError, ToolResponseError
 from meta_mcp.meta_client import AuthLoginBeginRequest, AuthLoginCompleteRequest, GraphRequestInput
 from meta_mcp.meta_client.models import ToolResponse
 
+_GRAPH_GET = GraphRequestInput(method="GET", path="/v18.0/test")
+
 
 class DummySession:
     def __init__(self, factory: Callable[[str], dict[str, Any]]) -> None:
         self.factory = factory
-        self.calls: list[tuple[str, dict[str, Any] | None]] = []
-
-    async def call_tool(self, name: str, arguments: dict[str, Any] | None = None, **_: Any) -> types.CallToolResult:
-        self.calls.append((name, arguments))
-        return types.CallToolResult(content=[], structuredContent=self.factory(name), isError=False)
+        self.calls: list[tuple[str, dict[str, Any] | None]] | None = None
+        self._record = False
+        self._result_cache: dict[str, types.CallToolResult] = {}
 
+    def record(self) -> None:
+        """Start keeping ``(name, arguments)`` for each call; off by default."""
+        self._record = True
+        self.calls = []
 
-@pytest.mark.asyncio
-async def test_sdk_call_tool_raw_normalizes_models(monkeypatch) -> None:
-    sdk = MetaMcpSdk(base_url="http://localhost")
+    async def call_tool(self, name: str, arguments: dict[str, Any] | None = None, **_: Any) -> types.CallToolResult:
+        if self._record:
+            self.calls.append((name, arguments))  # type: ignore[union-attr]
+        # The SDK never mutates results, so one per tool name is reused
+        result = self._result_cache.get(name)
+        if result is None:
+            result = types.CallToolResult(
+                content=[], structuredContent=self.factory(name), isError=False
+            )
+            self._result_cache[name] = result
+        return result
+
+
+async def test_sdk_call_tool_raw_normalizes_models(monkeypatch, shared_sdk) -> None:
+    sdk = shared_sdk
     response_payload = {"ok": True, "data": {"result": True}, "meta": {}}
     sdk._session = DummySession(lambda _: response_payload)  # type: ignore[assignment]
-    request = GraphRequestInput(method="GET", path="/v18.0/test")
-    result = await sdk.call_tool_raw("graph.request", request)
+    sdk._session.record()  # type: ignore[attr-defined]
+    result = await sdk.call_tool_raw("graph.request", _GRAPH_GET)
     assert result.data["result"] is True
     assert sdk._session.calls[0][1]["method"] == "GET"  # type: ignore[index]
 
 
-@pytest.mark.asyncio
-async def test_sdk_raises_on_error_response() -> None:
-    sdk = MetaMcpSdk(base_url="http://localhost")
+async def test_sdk_raises_on_error_response(shared_sdk) -> None:
+    sdk = shared_sdk
     error_payload = {"ok": False, "error": {"code": "AUTH", "message": "nope"}, "meta": {}}
     sdk._session = DummySession(lambda _: error_payload)  # type: ignore[assignment]
     with pytest.raises(ToolExecutionError):
         await sdk.call_tool_raw("graph.request", None)
 
 
-@pytest.mark.asyncio
-async def test_publish_ig_image_requires_creation_id(monkeypatch) -> None:
-    sdk = MetaMcpSdk(base_url="http://localhost")
+async def test_publish_ig_image_requires_creation_id(monkeypatch, shared_sdk) -> None:
+    sdk = shared_sdk
 
     async def fake_call(name: str, *_args: Any, **_kwargs: Any) -> ToolResponse:
         if name == "ig.media.create":
@@ -55,11 +69,10 @@ async def test_publish_ig_image_requires_creation_id(monkeypatch) -> None:
         await sdk.publish_ig_image(ig_user_id="123", image_url="https://example.com/img.jpg")
 
 
-@pytest.mark.asyncio
-async def test_sdk_auth_login_methods() -> None:
+async def test_sdk_auth_login_methods(shared_sdk) -> None:
     begin_payload = {"ok": True, "data": {"authorization_url": "https://example.com/oauth", "state": "state123", "redirect_uri": "https://client.example.com/callback", "scopes": ["pages_manage_posts"]}, "meta": {}}
     complete_payload = {"ok": True, "data": {"access_token": "token123", "token_type": "bearer", "expires_at": "2024-01-01T00:00:00+00:00", "app_id": "app", "subject_id": "sub", "scopes": ["pages_manage_posts"]}, "meta": {}}
-    sdk = MetaMcpSdk(base_url="http://localhost")
+    sdk = shared_sdk
     sdk._session = DummySession(lambda name: begin_payload if name == "auth.login.begin" else complete_payload)  # type: ignore[assignment]
     begin_response = await sdk.auth_login_begin(AuthLoginBeginRequest(scopes=["pages_manage_posts"]))
     assert str(begin_response.authorization_url) == "https://example.com/oauth"
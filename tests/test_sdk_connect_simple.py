@@ -1,52 +1,76 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+from typing import Any
 
-import pytest
+from mcp import types
 
+import mcp_meta_sdk.client as sdk_client
 from mcp_meta_sdk import MetaMcpSdk
 
+_PERMISSIONS_RESULT = types.CallToolResult(
+    content=[],
+    structuredContent={
+        "ok": True,
+        "data": {"app_id": "1", "type": "p", "scopes": [], "valid": True, "expires_at": None},
+        "meta": {},
+    },
+    isError=False,
+)
 
-@pytest.mark.asyncio
-async def test_connect_mock_session():
-    with patch("mcp_meta_sdk.client.streamablehttp_client") as mock_client,          patch("mcp_meta_sdk.client.ClientSession") as mock_session_cls:
-        
-        mock_ctx = AsyncMock()
-        mock_client.return_value = mock_ctx
-        mock_ctx.__aenter__.return_value = (MagicMock(), MagicMock(), MagicMock(return_value="sess_1"))
-        
-        mock_session = AsyncMock()
-        mock_session_cls.return_value = mock_session
-        
-        # Configure call_tool return value
-        mock_result = MagicMock()
-        mock_result.structuredContent = {
-            "ok": True, 
-            "data": {"app_id": "1", "type": "p", "scopes": [], "valid": True, "expires_at": None}, 
-            "meta": {}
-        }
-        mock_session.call_tool.return_value = mock_result
-        
-        async with MetaMcpSdk(base_url="http://localhost") as sdk:
-            assert sdk.session_id == "sess_1"
-            await sdk.auth_permissions_check("tok")
-            
-        mock_session.initialize.assert_awaited_once()
-        mock_session.call_tool.assert_awaited()
-        mock_ctx.__aexit__.assert_awaited()
-
-@pytest.mark.asyncio
-async def test_connect_mock_session_twice():
-    with patch("mcp_meta_sdk.client.streamablehttp_client") as mock_client,          patch("mcp_meta_sdk.client.ClientSession") as mock_session_cls:
-        
-        mock_ctx = AsyncMock()
-        mock_client.return_value = mock_ctx
-        mock_ctx.__aenter__.return_value = (MagicMock(), MagicMock(), MagicMock())
-        
-        mock_session = AsyncMock()
-        mock_session_cls.return_value = mock_session
-        
-        sdk = MetaMcpSdk(base_url="http://localhost")
-        await sdk.connect()
-        await sdk.connect()
-        
-        assert mock_session.initialize.call_count == 1
-        await sdk.close()
+
+class _FakeTransport:
+    """Stands in for ``streamablehttp_client``: an async context yielding the stream triple."""
+
+    def __init__(self, session_id: str | None = None) -> None:
+        self.session_id = session_id
+        self.exits = 0
+
+    def __call__(self, **_: Any) -> "_FakeTransport":
+        return self
+
+    async def __aenter__(self) -> tuple[object, object, Any]:
+        return object(), object(), lambda: self.session_id
+
+    async def __aexit__(self, *_: Any) -> None:
+        self.exits += 1
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.init_calls = 0
+        self.tool_calls = 0
+
+    def __call__(self, *_: Any, **__: Any) -> "_FakeSession":
+        return self
+
+    async def initialize(self) -> None:
+        self.init_calls += 1
+
+    async def call_tool(self, *_: Any, **__: Any) -> types.CallToolResult:
+        self.tool_calls += 1
+        return _PERMISSIONS_RESULT
+
+
+async def test_connect_mock_session(monkeypatch):
+    transport = _FakeTransport(session_id="sess_1")
+    session = _FakeSession()
+    monkeypatch.setattr(sdk_client, "streamablehttp_client", transport)
+    monkeypatch.setattr(sdk_client, "ClientSession", session)
+
+    async with MetaMcpSdk(base_url="http://localhost") as sdk:
+        assert sdk.session_id == "sess_1"
+        await sdk.auth_permissions_check("tok")
+
+    assert session.init_calls == 1
+    assert session.tool_calls >= 1
+    assert transport.exits == 1
+
+async def test_connect_mock_session_twice(monkeypatch):
+    session = _FakeSession()
+    monkeypatch.setattr(sdk_client, "streamablehttp_client", _FakeTransport())
+    monkeypatch.setattr(sdk_client, "ClientSession", session)
+
+    sdk = MetaMcpSdk(base_url="http://localhost")
+    await sdk.connect()
+    await sdk.connect()
+
+    assert session.init_calls == 1
+    await sdk.close()
@@ -3,47 +3,41 @@ from typing import Any
 import pytest
 from mcp import types
 
-from mcp_meta_sdk import MetaMcpSdk, ToolExecutionError, ToolResponseError
+from mcp_meta_sdk import ToolExecutionError, ToolResponseError
+
+_MODE_PAYLOADS: dict[str, dict[str, Any] | None] = {
+    "no_content": None,
+    "error_response": {"ok": False, "error": {"code": "ERR"}, "meta": {}},
+    "success_false": {"ok": False, "meta": {}},
+    "ok": {"ok": True, "data": {}, "meta": {}},
+}
 
 
 class ErrorSession:
     def __init__(self, mode="ok"):
         self.mode = mode
+        self._result = types.CallToolResult(
+            content=[], structuredContent=_MODE_PAYLOADS[mode], isError=False
+        )
 
     async def call_tool(self, name: str, arguments: dict | None = None, **_: Any) -> types.CallToolResult:
-        if self.mode == "no_content":
-            return types.CallToolResult(content=[], structuredContent=None, isError=False)
-        if self.mode == "error_response":
-            return types.CallToolResult(content=[], structuredContent={"ok": False, "error": {"code": "ERR"}, "meta": {}}, isError=False)
-        if self.mode == "success_false":
-            return types.CallToolResult(content=[], structuredContent={"ok": False, "meta": {}}, isError=False)
-        return types.CallToolResult(content=[], structuredContent={"ok": True, "data": {}, "meta": {}}, isError=False)
-
-@pytest.mark.asyncio
-async def test_sdk_no_content():
-    sdk = MetaMcpSdk(base_url="http://localhost")
-    sdk._session = ErrorSession("no_content")
-    with pytest.raises(ToolResponseError, match="returned no structured content"):
-        await sdk.call_tool_raw("test")
-
-@pytest.mark.asyncio
-async def test_sdk_error_response():
-    sdk = MetaMcpSdk(base_url="http://localhost")
-    sdk._session = ErrorSession("error_response")
-    with pytest.raises(ToolExecutionError) as exc:
-        await sdk.call_tool_raw("test")
-    assert exc.value.code == "ERR"
-
-@pytest.mark.asyncio
-async def test_sdk_success_false():
-    sdk = MetaMcpSdk(base_url="http://localhost")
-    sdk._session = ErrorSession("success_false")
-    with pytest.raises(ToolExecutionError):
-        await sdk.call_tool_raw("test")
-
-@pytest.mark.asyncio
-async def test_sdk_normalize_arguments():
-    sdk = MetaMcpSdk(base_url="http://localhost")
+        return self._result
+
+@pytest.mark.parametrize(
+    ("mode", "exc", "match"),
+    [
+        ("no_content", ToolResponseError, "returned no structured content"),
+        ("error_response", ToolExecutionError, r"\[ERR\]"),
+        ("success_false", ToolExecutionError, None),
+    ],
+)
+async def test_sdk_error_modes(shared_sdk, mode, exc, match):
+    shared_sdk._session = ErrorSession(mode)
+    with pytest.raises(exc, match=match):
+        await shared_sdk.call_tool_raw("test")
+
+async def test_sdk_normalize_arguments(shared_sdk):
+    sdk = shared_sdk
     assert sdk._normalize_arguments(None) is None
     assert sdk._normalize_arguments({"a": 1}) == {"a": 1}
     
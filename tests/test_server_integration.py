@@ -7,19 +7,31 @@ These tests verify:
 
 from __future__ import annotations
 
+import asyncio
+import functools
+from collections.abc import Iterator
+
 import httpx
 import pytest
 
-respx = pytest.importorskip("respx")
-
+from meta_mcp.auth import MetaOAuthClient
 from meta_mcp.config import MetaMcpSettings
-from meta_mcp.meta_client import AuthLoginBeginRequest, AuthLoginCompleteRequest
+from meta_mcp.mcp_tools import auth_login
+from meta_mcp.mcp_tools.common import ToolEnvironment
+from meta_mcp.meta_client import (
+    AuthLoginBeginRequest,
+    AuthLoginCompleteRequest,
+    MetaGraphApiClient,
+)
+from meta_mcp.meta_client.auth import TokenService
 from meta_mcp.server import create_server
+from meta_mcp.storage.queue import WebhookEventQueue
 
 
-@pytest.fixture
-def test_settings(tmp_path):
+@pytest.fixture(scope="module")
+def test_settings(tmp_path_factory):
     """Create test settings with temporary database."""
+    tmp_path = tmp_path_factory.mktemp("server")
     return MetaMcpSettings(
         app_id="test_app_id",
         app_secret="test_secret",
@@ -33,7 +45,6 @@ def test_settings(tmp_path):
     )
 
 
-@pytest.mark.asyncio
 async def test_server_creates_successfully(test_settings):
     """Test that the server can be created with all tools registered.
     
@@ -54,9 +65,66 @@ async def test_server_creates_successfully(test_settings):
     # This is the REAL test - if this passes, the server works!
 
 
-@pytest.mark.asyncio
-@respx.mock
-async def test_oauth_login_complete_workflow(test_settings):
+# Meta's token exchange and debug_token endpoints, keyed by request path
+_META_RESPONSES = {
+    "/v18.0/oauth/access_token": {
+        "access_token": "user_access_token_123",
+        "token_type": "bearer",
+        "expires_in": 5183944,  # ~60 days
+    },
+    "/v18.0/debug_token": {
+        "data": {
+            "app_id": "test_app_id",
+            "type": "USER",
+            "application": "Test App",
+            "is_valid": True,
+            "scopes": ["pages_manage_posts", "pages_read_engagement"],
+            "user_id": "123456789",
+            "expires_at": 1735689600,  # Unix timestamp
+        }
+    },
+}
+
+
+def _meta_api(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=_META_RESPONSES[request.url.path])
+
+
+# Both Meta calls are answered in-process by one transport, no global HTTP patching
+_META_TRANSPORT = httpx.MockTransport(_meta_api)
+
+
+@pytest.fixture(scope="module")
+def meta_client(test_settings) -> Iterator[MetaGraphApiClient]:
+    """Graph client built once on the mock transport."""
+
+    client = MetaGraphApiClient(settings=test_settings, transport=_META_TRANSPORT)
+    yield client
+    asyncio.run(client.aclose())
+
+
+@pytest.fixture(scope="module")
+def login_tools(test_settings, meta_client, module_stub_server):
+    """``auth_login`` tools registered once, with the OAuth client on the mock transport."""
+
+    env = ToolEnvironment(
+        settings=test_settings,
+        client=meta_client,
+        token_service=TokenService(meta_client),
+        event_queue=WebhookEventQueue(),
+    )
+    # register() builds its MetaOAuthClient up front, so the patch only has to cover this call
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(
+            auth_login,
+            "MetaOAuthClient",
+            functools.partial(MetaOAuthClient, transport=_META_TRANSPORT),
+        )
+        auth_login.register(module_stub_server, env)
+    return module_stub_server.tools
+
+
+async def test_oauth_login_complete_workflow(test_settings, login_tools):
     """Test the COMPLETE OAuth login workflow end-to-end.
     
     This is THE workflow all users go through:
@@ -70,63 +138,13 @@ async def test_oauth_login_complete_workflow(test_settings):
     
     If this fails, users can't even get started!
     """
-    server = create_server(test_settings)
-    
-    # Access the tool handlers directly from the server's registered tools
-    # We'll call them through the tool decorator interface
-    
-    # Step 1: Begin OAuth flow
-    # We need to directly test the tool handlers that were registered
-    # For now, we'll test using the existing test approach from test_auth_login.py
-    # Create tool environment (use test_settings)
-    # We need to ensure the client uses our test settings
-    from meta_mcp.config import get_settings
-    from meta_mcp.mcp_tools import auth_login
-    from meta_mcp.mcp_tools.common import ToolEnvironment
-    from meta_mcp.meta_client import MetaGraphApiClient
-    from meta_mcp.meta_client.auth import TokenService
-    from meta_mcp.storage.queue import WebhookEventQueue
-    get_settings.cache_clear()  # Clear any cached settings
-    
-    # Create client that will use test_settings
-    client = MetaGraphApiClient()
-    # Override the client's settings with test_settings
-    client.settings = test_settings
-    # Recreate the httpx client with correct base_url
-    client._client = httpx.AsyncClient(
-        base_url=test_settings.graph_api_base_url,
-        timeout=httpx.Timeout(test_settings.default_timeout_seconds),
-        headers={"Accept": "application/json"},
-    )
-    
-    token_service = TokenService(client)
-    event_queue = WebhookEventQueue()
-    env = ToolEnvironment(
-        settings=test_settings,
-        client=client,
-        token_service=token_service,
-        event_queue=event_queue,
-    )
-    
-    # Create a stub server to register tools
-    class _StubServer:
-        def __init__(self):
-            self.tools = {}
-        
-        def tool(self, name: str, structured_output: bool = True, **kwargs):
-            def decorator(fn):
-                self.tools[name] = fn
-                return fn
-            return decorator
-    
-    stub_server = _StubServer()
-    auth_login.register(stub_server, env)
+    create_server(test_settings)
     
     begin_request = AuthLoginBeginRequest(
         scopes=["pages_manage_posts", "pages_read_engagement"]
     )
     
-    begin_result = await stub_server.tools["auth.login.begin"](begin_request, None)
+    begin_result = await login_tools["auth.login.begin"](begin_request, None)
     
     # Verify we got an authorization URL
     assert begin_result["ok"] is True
@@ -143,35 +161,7 @@ async def test_oauth_login_complete_workflow(test_settings):
     assert "pages_read_engagement" in auth_url
     assert state in auth_url
     
-    # Step 2: Mock Meta's token exchange endpoint
-    respx.get("https://test.example.com/v18.0/oauth/access_token").mock(
-        return_value=httpx.Response(
-            200,
-            json={
-                "access_token": "user_access_token_123",
-                "token_type": "bearer",
-                "expires_in": 5183944,  # ~60 days
-            },
-        )
-    )
-    
-    # Step 3: Mock the debug_token endpoint (validates the token)
-    respx.get("https://test.example.com/v18.0/debug_token").mock(
-        return_value=httpx.Response(
-            200,
-            json={
-                "data": {
-                    "app_id": "test_app_id",
-                    "type": "USER",
-                    "application": "Test App",
-                    "is_valid": True,
-                    "scopes": ["pages_manage_posts", "pages_read_engagement"],
-                    "user_id": "123456789",
-                    "expires_at": 1735689600,  # Unix timestamp
-                }
-            },
-        )
-    )
+    # Steps 2-3: Meta's token exchange and debug_token endpoints are served by _meta_api
     
     # Step 4: Complete OAuth flow with the code
     # In real workflow: Meta redirects back with code and state
@@ -182,10 +172,7 @@ async def test_oauth_login_complete_workflow(test_settings):
         expected_state=state,  # We verify it matches
     )
     
-    complete_result = await stub_server.tools["auth.login.complete"](complete_request, None)
-    
-    # Cleanup
-    await client.aclose()
+    complete_result = await login_tools["auth.login.complete"](complete_request, None)
     
     # Verify we got the access token back  
     # Debug: print if failed
@@ -0,0 +1,46 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+from sqlalchemy.pool import StaticPool
+
+from meta_mcp.config import get_settings
+from meta_mcp.storage.db import _configure_sqlite, _pool_options, get_engine, get_session_factory
+
+pytestmark = pytest.mark.no_db
+
+
+def test_pool_options_for_sqlite():
+    settings = get_settings()
+    assert (
+        _pool_options(settings.model_copy(update={"database_url": "sqlite+aiosqlite:///./x.db"}))
+        == {}
+    )
+    assert _pool_options(settings.model_copy(update={"database_url": "sqlite+aiosqlite://"})) == {
+        "poolclass": StaticPool
+    }
+    assert _pool_options(settings) == {"poolclass": StaticPool}
+
+
+def test_pool_options_for_asyncpg(settings):
+    settings = settings.model_copy(
+        update={"database_url": "postgresql+asyncpg://user:pw@localhost/meta", "db_pool_size": 7}
+    )
+    options = _pool_options(settings)
+    assert options["pool_size"] == 7
+    assert options["max_overflow"] == settings.db_max_overflow
+    assert options["pool_pre_ping"] is True
+    assert "connect_args" not in options
+
+
+def test_engine_and_session_factory_are_singletons():
+    assert get_engine() is get_engine()
+    assert get_session_factory() is get_session_factory()
+    assert get_session_factory().kw["bind"] is get_engine()
+
+
+def test_sqlite_connections_use_wal(tmp_path):
+    with closing(sqlite3.connect(tmp_path / "wal.db")) as conn:
+        _configure_sqlite(conn, None)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
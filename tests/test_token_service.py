@@ -1,33 +1,45 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
 import pytest
 
 from meta_mcp.errors import McpErrorCode, MCPException
 from meta_mcp.meta_client.auth import TokenService
-from meta_mcp.storage import TokenType
+from meta_mcp.storage import Token, TokenType, session_scope
 
 
 class StubMetaClient:
     def __init__(self, *, scopes: list[str]) -> None:
         self.scopes = scopes
         self.calls = 0
-
-    async def debug_token(self, *, access_token: str) -> dict[str, object]:
-        self.calls += 1
-        return {
+        # TokenService only reads the payload, so one copy is returned on every call.
+        self._payload: dict[str, object] = {
             "app_id": "123",
             "type": "PAGE",
-            "scopes": self.scopes,
+            "scopes": scopes,
             "expires_at": None,
             "is_valid": True,
             "user_id": "user",
         }
 
+    async def debug_token(self, *, access_token: str) -> dict[str, object]:
+        self.calls += 1
+        return self._payload
+
+
+@pytest.fixture
+def make_service() -> Callable[[list[str]], tuple[StubMetaClient, TokenService]]:
+    def factory(scopes: list[str]) -> tuple[StubMetaClient, TokenService]:
+        client = StubMetaClient(scopes=scopes)
+        return client, TokenService(client)  # type: ignore[arg-type]
 
-@pytest.mark.asyncio
-async def test_token_service_caches_token() -> None:
-    client = StubMetaClient(scopes=["pages_read_engagement"])
-    service = TokenService(client)  # type: ignore[arg-type]
+    return factory
+
+
+async def test_token_service_caches_token(make_service) -> None:
+    client, service = make_service(["pages_read_engagement"])
     await service.ensure_permissions(
         access_token="token",
         required_scopes=["pages_read_engagement"],
@@ -41,10 +53,8 @@ async def test_token_service_caches_token() -> None:
     assert client.calls == 1
 
 
-@pytest.mark.asyncio
-async def test_token_service_missing_scope_raises() -> None:
-    client = StubMetaClient(scopes=["pages_read_engagement"])
-    service = TokenService(client)  # type: ignore[arg-type]
+async def test_token_service_missing_scope_raises(make_service) -> None:
+    _, service = make_service(["pages_read_engagement"])
     with pytest.raises(MCPException) as exc:
         await service.ensure_permissions(
             access_token="token",
@@ -54,10 +64,8 @@ async def test_token_service_missing_scope_raises() -> None:
     assert exc.value.error.code == McpErrorCode.PERMISSION
 
 
-@pytest.mark.asyncio
-async def test_ig_publish_cap() -> None:
-    client = StubMetaClient(scopes=["instagram_basic", "instagram_content_publish"])
-    service = TokenService(client)  # type: ignore[arg-type]
+async def test_ig_publish_cap(make_service) -> None:
+    _, service = make_service(["instagram_basic", "instagram_content_publish"])
     await service.ensure_permissions(
         access_token="ig-token",
         required_scopes=["instagram_basic"],
@@ -68,3 +76,31 @@ async def test_ig_publish_cap() -> None:
     with pytest.raises(MCPException) as exc:
         await service.assert_ig_publish_allowed(ig_user_id="ig")
     assert exc.value.error.code == McpErrorCode.RATE_LIMIT
+
+
+async def test_token_service_refreshes_stale_token_in_place(make_service) -> None:
+    client, service = make_service(["pages_read_engagement"])
+    token_hash = service._hash_token("stale-token")
+    async with session_scope() as session:
+        session.add(
+            Token(
+                id=token_hash,
+                type=TokenType.PAGE,
+                subject_id="old",
+                scopes=[],
+                app_id="123",
+                issued_at=datetime.now(timezone.utc),
+                expires_at=datetime.now(timezone.utc) + timedelta(minutes=1),
+                raw_metadata={},
+            )
+        )
+
+    metadata = await service.inspect_token(access_token="stale-token")
+    assert client.calls == 1
+    assert metadata.subject_id == "user"
+
+    async with session_scope() as session:
+        row = await session.get(Token, token_hash)
+        assert row is not None
+        assert row.subject_id == "user"
+        assert row.scopes == ["pages_read_engagement"]
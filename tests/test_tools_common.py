@@ -1,8 +1,12 @@
-from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock, Mock
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
+from pydantic import SecretStr
 
+from meta_mcp import serialization
 from meta_mcp.errors import MCPException
 from meta_mcp.mcp_tools.common import (
     ToolEnvironment,
@@ -11,6 +15,7 @@ from meta_mcp.mcp_tools.common import (
     ensure_scopes,
     extract_meta,
     perform_graph_call,
+    perform_paginated_graph_call,
     resolve_access_token,
 )
 
@@ -23,10 +28,33 @@ def test_compute_idempotency_key():
     assert key1 == key2
     assert key1 != key3
 
-def test_datetime_to_timestamp():
-    assert datetime_to_timestamp(None) is None
-    dt = datetime(2023, 1, 1, 12, 0, 0)
-    assert datetime_to_timestamp(dt) == int(dt.timestamp())
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"message": "héllo", "b": [1, 2], "a": {"z": None, "y": True}},
+        {"a": {1: 2, None: 3, 1.5: 4}, "flags": {True: "x"}},
+        {"floats": [0.1, 1.0, 1e-05, 1.23e-07, 1e16, 1.2345678901234568e20, -0.0]},
+        {"big": 2**70},
+    ],
+    ids=["strings", "non_str_keys", "floats", "big_int"],
+)
+def test_compute_idempotency_key_matches_without_orjson(monkeypatch, payload):
+    key = compute_idempotency_key(method="POST", path="/me/feed", payload=payload)
+    with_orjson = serialization.dumps(payload, sort_keys=True)
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert serialization.dumps(payload, sort_keys=True) == with_orjson
+    assert compute_idempotency_key(method="POST", path="/me/feed", payload=payload) == key
+
+
+@pytest.mark.parametrize(
+    "value",
+    [None, datetime(2023, 1, 1, 12, 0, 0), datetime(2023, 1, 1, tzinfo=timezone.utc)],
+    ids=["none", "naive", "aware"],
+)
+def test_datetime_to_timestamp(value):
+    expected = None if value is None else int(value.timestamp())
+    assert datetime_to_timestamp(value) == expected
 
 def test_extract_meta():
     headers = {
@@ -39,91 +67,82 @@ def test_extract_meta():
     assert meta["fbtrace_id"] == "trace123"
     assert "other-header" not in meta
 
-def test_resolve_access_token_provided():
-    ctx = MagicMock()
-    token = resolve_access_token(ctx, provided="token123")
-    assert token == "token123"
+def _request_context(meta=None, arguments=None):
+    request = (
+        SimpleNamespace(params=SimpleNamespace(arguments=arguments))
+        if arguments is not None
+        else None
+    )
+    return SimpleNamespace(request_context=SimpleNamespace(meta=meta, request=request))
 
-def test_resolve_access_token_from_meta():
-    ctx = MagicMock()
-    # Mock request_context.meta as a dict-like object
-    ctx.request_context.meta = {"access_token": "meta_token"}
-    token = resolve_access_token(ctx)
-    assert token == "meta_token"
-
-def test_resolve_access_token_from_meta_model():
-    ctx = MagicMock()
-    # Mock request_context.meta as a Pydantic-like model
-    meta_mock = MagicMock()
-    meta_mock.model_dump.return_value = {"accessToken": "model_token"}
-    ctx.request_context.meta = meta_mock
-    token = resolve_access_token(ctx)
-    assert token == "model_token"
-
-def test_resolve_access_token_from_args():
-    ctx = MagicMock()
-    ctx.request_context.meta = {}
-    ctx.request_context.request.params.arguments = {"access_token": "arg_token"}
-    token = resolve_access_token(ctx)
-    assert token == "arg_token"
-
-def test_resolve_access_token_system_user():
-    ctx = MagicMock()
-    # Fix: Ensure request_context is not None, but has empty/None attributes
-    ctx.request_context = MagicMock()
-    ctx.request_context.meta = None
-    ctx.request_context.request = None
-    
-    settings = MagicMock()
-    settings.system_user_access_token.get_secret_value.return_value = "system_token"
-    token = resolve_access_token(ctx, settings=settings)
-    assert token == "system_token"
-
-def test_resolve_access_token_missing():
-    ctx = MagicMock()
-    ctx.request_context = MagicMock()
-    ctx.request_context.meta = None
-    ctx.request_context.request = None
-    
-    settings = MagicMock()
-    settings.system_user_access_token = None
-    with pytest.raises(MCPException):
-        resolve_access_token(ctx, settings=settings)
-
-@pytest.mark.asyncio
-async def test_ensure_scopes():
-    env = MagicMock(spec=ToolEnvironment)
-    env.settings = MagicMock()
-    env.token_service = AsyncMock()
-    env.token_service.ensure_permissions.return_value = Mock(subject_id="123", type=Mock(value="page"))
-    
-    ctx = MagicMock()
-    ctx.request_context.meta = {"access_token": "token123"}
-    
+
+def _meta_model(payload):
+    model = MagicMock()
+    model.model_dump.return_value = payload
+    return model
+
+
+_SYSTEM_SETTINGS = SimpleNamespace(system_user_access_token=SecretStr("system_token"))
+_NO_TOKEN_SETTINGS = SimpleNamespace(system_user_access_token=None)
+
+# scenario -> (ctx, provided, settings, expected token or None when resolution must fail)
+_RESOLVE_CASES = {
+    "provided": (_request_context(), "token123", None, "token123"),
+    "meta_dict": (_request_context(meta={"access_token": "meta_token"}), None, None, "meta_token"),
+    "meta_model": (
+        _request_context(meta=_meta_model({"accessToken": "model_token"})),
+        None,
+        None,
+        "model_token",
+    ),
+    "args": (
+        _request_context(meta={}, arguments={"access_token": "arg_token"}),
+        None,
+        None,
+        "arg_token",
+    ),
+    "system": (_request_context(), None, _SYSTEM_SETTINGS, "system_token"),
+    "missing": (_request_context(), None, _NO_TOKEN_SETTINGS, None),
+}
+
+
+@pytest.mark.parametrize("scenario", list(_RESOLVE_CASES))
+def test_resolve_access_token(scenario):
+    ctx, provided, settings, expected = _RESOLVE_CASES[scenario]
+    if expected is None:
+        with pytest.raises(MCPException):
+            resolve_access_token(ctx, provided=provided, settings=settings)
+    else:
+        assert resolve_access_token(ctx, provided=provided, settings=settings) == expected
+
+
+# Token metadata as the tools read it: only subject_id and type.value are consulted.
+_METADATA = SimpleNamespace(subject_id="123", type=SimpleNamespace(value="page"))
+
+
+@pytest.fixture
+def env(settings):
+    token_service = AsyncMock()
+    token_service.ensure_permissions.return_value = _METADATA
+    return ToolEnvironment(
+        settings=settings, client=AsyncMock(), token_service=token_service, event_queue=None
+    )
+
+
+async def test_ensure_scopes(env, ctx):
     token, metadata = await ensure_scopes(env=env, ctx=ctx, required_scopes=["scope1"])
-    
+
     assert token == "token123"
     assert metadata.subject_id == "123"
     env.token_service.ensure_permissions.assert_awaited_once()
 
-@pytest.mark.asyncio
-async def test_perform_graph_call_success():
-    env = MagicMock(spec=ToolEnvironment)
-    env.settings = MagicMock()
-    env.token_service = AsyncMock()
-    metadata_mock = Mock(subject_id="123", type=Mock(value="page"))
-    env.token_service.ensure_permissions.return_value = metadata_mock
-    
-    env.client = AsyncMock()
-    response_mock = MagicMock()
-    response_mock.status_code = 200
-    response_mock.headers = {"x-app-usage": "5%"}
-    response_mock.json.return_value = {"id": "456"}
-    env.client.request.return_value = response_mock
-    
-    ctx = MagicMock()
-    ctx.request_context.meta = {"access_token": "token123"}
-    
+
+async def test_perform_graph_call_success(env, ctx, expect_ok):
+    env.client.request_with_json.return_value = (
+        httpx.Response(200, json={"id": "456"}, headers={"x-app-usage": "5%"}),
+        {"id": "456"},
+    )
+
     result = await perform_graph_call(
         env=env,
         ctx=ctx,
@@ -133,34 +152,20 @@ async def test_perform_graph_call_success():
         body={"message": "hello"},
         required_scopes=["publish"],
     )
-    
-    assert result["ok"] is True
-    assert result["data"]["data"] == {"id": "456"}
+
+    expect_ok(result, "data", "data", eq={"id": "456"})
     assert result["meta"]["x-app-usage"] == "5%"
     assert result["meta"]["token_subject_id"] == "123"
-    
-    env.client.request.assert_awaited_once()
-    call_args = env.client.request.await_args
+
+    env.client.request_with_json.assert_awaited_once()
+    call_args = env.client.request_with_json.await_args
     assert call_args.kwargs["json_body"] == {"message": "hello"}
     assert call_args.kwargs["method"] == "POST"
 
-@pytest.mark.asyncio
-async def test_perform_graph_call_idempotency():
-    env = MagicMock(spec=ToolEnvironment)
-    env.settings = MagicMock()
-    env.token_service = AsyncMock()
-    env.token_service.ensure_permissions.return_value = Mock(subject_id="123", type=Mock(value="page"))
-    
-    env.client = AsyncMock()
-    response_mock = MagicMock()
-    response_mock.status_code = 200
-    response_mock.headers = {}
-    response_mock.json.return_value = {}
-    env.client.request.return_value = response_mock
-    
-    ctx = MagicMock()
-    ctx.request_context.meta = {"access_token": "token123"}
-    
+
+async def test_perform_graph_call_idempotency(env, ctx):
+    env.client.request_with_json.return_value = (httpx.Response(200, json={}), {})
+
     await perform_graph_call(
         env=env,
         ctx=ctx,
@@ -171,6 +176,19 @@ async def test_perform_graph_call_idempotency():
         required_scopes=["publish"],
         idempotency=True,
     )
-    
-    call_args = env.client.request.await_args
+
+    call_args = env.client.request_with_json.await_args
     assert call_args.kwargs["idempotency_key"] is not None
+
+
+@pytest.mark.parametrize("max_pages", [0, 1])
+async def test_perform_paginated_graph_call_fetches_at_least_one_page(env, ctx, max_pages):
+    body = {"data": [{"id": "1"}], "paging": {"cursors": {"after": "abc"}}}
+    env.client.request_with_json.return_value = (httpx.Response(200, json=body), body)
+
+    result = await perform_paginated_graph_call(
+        env=env, ctx=ctx, path="/1/posts", query=None, max_pages=max_pages, required_scopes=[]
+    )
+
+    assert result["data"]["data"] == body
+    env.client.request_with_json.assert_awaited_once()
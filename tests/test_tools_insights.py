@@ -1,10 +1,5 @@
-from unittest.mock import AsyncMock, MagicMock
-
 import pytest
-from httpx import Response
 
-from meta_mcp.config import get_settings
-from meta_mcp.mcp_tools.common import ToolEnvironment
 from meta_mcp.mcp_tools.insights import (
     InsightsAdsAccount,
     InsightsIgAccount,
@@ -12,50 +7,23 @@ from meta_mcp.mcp_tools.insights import (
     InsightsPageAccount,
     register,
 )
-from meta_mcp.meta_client import MetaGraphApiClient, TokenService
-from meta_mcp.storage.queue import WebhookEventQueue
 
+pytestmark = [pytest.mark.graph_router, pytest.mark.xdist_group(name="meta_tools")]
 
-@pytest.fixture
-async def tool_env():
-    settings = get_settings()
-    client = MetaGraphApiClient()
-    token_service = AsyncMock(spec=TokenService)
-    metadata_mock = MagicMock()
-    metadata_mock.subject_id = "123"
-    metadata_mock.type.value = "page"
-    token_service.ensure_permissions.return_value = metadata_mock
-    event_queue = MagicMock(spec=WebhookEventQueue)
-    return ToolEnvironment(
-        settings=settings,
-        client=client,
-        token_service=token_service,
-        event_queue=event_queue,
-    )
 
-@pytest.fixture
-def registered_tools(tool_env):
-    server = MagicMock()
-    tools = {}
-    def tool_decorator(name=None, **kwargs):
-        def wrapper(func):
-            tools[name] = func
-            return func
-        return wrapper
-    server.tool.side_effect = tool_decorator
-    register(server, tool_env)
-    return tools
+@pytest.fixture(scope="module")
+def tool_register():
+    return register
+
 
-@pytest.fixture
-def ctx():
-    c = MagicMock()
-    c.request_context.meta = {"access_token": "token123"}
-    return c
+@pytest.fixture(autouse=True)
+def _reset_graph_router(graph_router):
+    graph_router.reset()
 
-@pytest.mark.asyncio
-async def test_page_account_insights(registered_tools, ctx, respx_mock):
-    route = respx_mock.get("https://example.com/v18.0/page_123/insights").mock(
-        return_value=Response(200, json={"data": [{"name": "page_impressions"}]})
+
+async def test_page_account_insights(registered_tools, ctx, graph_router, expect_ok):
+    graph_router.add(
+        "GET", "/v18.0/page_123/insights", 200, json={"data": [{"name": "page_impressions"}]}
     )
     
     func = registered_tools["insights.page.account"]
@@ -66,17 +34,15 @@ async def test_page_account_insights(registered_tools, ctx, respx_mock):
     )
     
     result = await func(args, ctx)
-    assert result["ok"] is True
-    assert result["data"]["data"]["data"][0]["name"] == "page_impressions"
+    expect_ok(result, "data", "data", "data", 0, "name", eq="page_impressions")
     
-    req = route.calls.last.request
+    req = graph_router.requests[-1]
     assert req.url.params["metric"] == "page_impressions,page_fans"
     assert req.url.params["period"] == "day"
 
-@pytest.mark.asyncio
-async def test_ig_account_insights(registered_tools, ctx, respx_mock):
-    route = respx_mock.get("https://example.com/v18.0/ig_user_123/insights").mock(
-        return_value=Response(200, json={"data": [{"name": "impressions"}]})
+async def test_ig_account_insights(registered_tools, ctx, graph_router, expect_ok):
+    graph_router.add(
+        "GET", "/v18.0/ig_user_123/insights", 200, json={"data": [{"name": "impressions"}]}
     )
     
     func = registered_tools["insights.ig.account"]
@@ -87,13 +53,11 @@ async def test_ig_account_insights(registered_tools, ctx, respx_mock):
     )
     
     result = await func(args, ctx)
-    assert result["ok"] is True
-    assert result["data"]["data"]["data"][0]["name"] == "impressions"
+    expect_ok(result, "data", "data", "data", 0, "name", eq="impressions")
 
-@pytest.mark.asyncio
-async def test_ig_media_insights(registered_tools, ctx, respx_mock):
-    route = respx_mock.get("https://example.com/v18.0/media_123/insights").mock(
-        return_value=Response(200, json={"data": [{"name": "engagement"}]})
+async def test_ig_media_insights(registered_tools, ctx, graph_router, expect_ok):
+    graph_router.add(
+        "GET", "/v18.0/media_123/insights", 200, json={"data": [{"name": "engagement"}]}
     )
     
     func = registered_tools["insights.ig.media"]
@@ -103,14 +67,10 @@ async def test_ig_media_insights(registered_tools, ctx, respx_mock):
     )
     
     result = await func(args, ctx)
-    assert result["ok"] is True
-    assert result["data"]["data"]["data"][0]["name"] == "engagement"
+    expect_ok(result, "data", "data", "data", 0, "name", eq="engagement")
 
-@pytest.mark.asyncio
-async def test_ads_account_insights(registered_tools, ctx, respx_mock):
-    route = respx_mock.get("https://example.com/v18.0/act_act_123/insights").mock(
-        return_value=Response(200, json={"data": [{"spend": "100"}]})
-    )
+async def test_ads_account_insights(registered_tools, ctx, graph_router, expect_ok):
+    graph_router.add("GET", "/v18.0/act_act_123/insights", 200, json={"data": [{"spend": "100"}]})
     
     func = registered_tools["insights.ads.account"]
     args = InsightsAdsAccount(
@@ -121,11 +81,10 @@ async def test_ads_account_insights(registered_tools, ctx, respx_mock):
     )
     
     result = await func(args, ctx)
-    assert result["ok"] is True
-    assert result["data"]["data"]["data"][0]["spend"] == "100"
+    expect_ok(result, "data", "data", "data", 0, "spend", eq="100")
     
     # Check how time_range was serialized. Httpx might have exploded it or not.
     # We verify that 'fields' is correct at least.
-    req = route.calls.last.request
+    req = graph_router.requests[-1]
     assert req.url.params["fields"] == "spend,impressions"
     assert req.url.params["level"] == "campaign"
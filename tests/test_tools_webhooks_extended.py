@@ -1,60 +1,48 @@
 import hashlib
 import hmac
-import json
-from unittest.mock import AsyncMock, MagicMock
+from functools import lru_cache
+from urllib.parse import urlencode
 
 import pytest
+from pydantic import SecretStr
 from starlette.requests import Request
 
-from meta_mcp.config import get_settings
-from meta_mcp.mcp_tools.common import ToolEnvironment
+from meta_mcp import serialization
 from meta_mcp.mcp_tools.webhooks import register
-from meta_mcp.storage.queue import WebhookEventQueue
+
+_BASE_SCOPE = {"type": "http", "query_string": b"", "headers": []}
 
 
 def create_request(method="GET", query_params=None, headers=None, body=b""):
     async def receive():
         return {"type": "http.request", "body": body, "more_body": False}
-    
-    scope = {
-        "type": "http",
-        "method": method,
-        "query_string": b"" if not query_params else "&".join([f"{k}={v}" for k,v in query_params.items()]).encode(),
-        "headers": [(k.lower().encode(), v.encode()) for k,v in (headers or {}).items()],
-    }
+
+    scope = {**_BASE_SCOPE, "method": method}
+    if query_params:
+        scope["query_string"] = urlencode(query_params).encode()
+    if headers:
+        scope["headers"] = [(k.lower().encode(), v.encode()) for k, v in headers.items()]
     return Request(scope, receive)
 
-@pytest.fixture
-def tool_env():
-    settings = get_settings()
-    settings.verify_token = "my_token"
-    settings.app_secret.get_secret_value = lambda: "my_secret"
-    
-    event_queue = AsyncMock(spec=WebhookEventQueue)
-    
-    env = MagicMock(spec=ToolEnvironment)
-    env.settings = settings
-    env.event_queue = event_queue
-    return env
-
-@pytest.fixture
-def webhook_handlers(tool_env):
-    server = MagicMock()
-    handlers = {}
-    
-    def route_decorator(path, methods=None, name=None):
-        def wrapper(func):
-            handlers[name] = func
-            return func
-        return wrapper
-        
-    server.custom_route.side_effect = route_decorator
-    register(server, tool_env)
-    return handlers
-
-@pytest.mark.asyncio
-async def test_webhook_verify_success(webhook_handlers):
-    verify = webhook_handlers["meta_webhook_verify"]
+
+@lru_cache(maxsize=64)
+def _sig(secret: bytes, body: bytes) -> str:
+    return hmac.new(secret, body, hashlib.sha256).hexdigest()
+
+
+@pytest.fixture(scope="module")
+def tool_register():
+    return register
+
+
+@pytest.fixture(scope="module")
+def settings(settings):
+    return settings.model_copy(
+        update={"verify_token": "my_token", "app_secret": SecretStr("my_secret")}
+    )
+
+async def test_webhook_verify_success(registered_routes):
+    verify = registered_routes["meta_webhook_verify"]
     req = create_request(
         method="GET",
         query_params={
@@ -67,9 +55,8 @@ async def test_webhook_verify_success(webhook_handlers):
     assert resp.status_code == 200
     assert resp.body == b"12345"
 
-@pytest.mark.asyncio
-async def test_webhook_verify_fail(webhook_handlers):
-    verify = webhook_handlers["meta_webhook_verify"]
+async def test_webhook_verify_fail(registered_routes):
+    verify = registered_routes["meta_webhook_verify"]
     req = create_request(
         method="GET",
         query_params={
@@ -81,9 +68,8 @@ async def test_webhook_verify_fail(webhook_handlers):
     resp = await verify(req)
     assert resp.status_code == 403
 
-@pytest.mark.asyncio
-async def test_webhook_handle_success(webhook_handlers, tool_env):
-    handle = webhook_handlers["meta_webhook_handler"]
+async def test_webhook_handle_success(registered_routes, event_queue):
+    handle = registered_routes["meta_webhook_handler"]
     
     payload = {
         "entry": [
@@ -95,15 +81,11 @@ async def test_webhook_handle_success(webhook_handlers, tool_env):
             }
         ]
     }
-    body = json.dumps(payload).encode()
-    
-    # Calculate signature
-    secret = b"my_secret"
-    sig = hmac.new(secret, body, hashlib.sha256).hexdigest()
-    
+    body = serialization.dumps(payload)
+
     req = create_request(
         method="POST",
-        headers={"X-Hub-Signature-256": f"sha256={sig}"},
+        headers={"X-Hub-Signature-256": f"sha256={_sig(b'my_secret', body)}"},
         body=body
     )
     
@@ -111,11 +93,10 @@ async def test_webhook_handle_success(webhook_handlers, tool_env):
     assert resp.status_code == 200
     
     # Verify event recorded
-    assert tool_env.event_queue.record_delivery.called
+    assert event_queue.deliveries
 
-@pytest.mark.asyncio
-async def test_webhook_handle_invalid_sig(webhook_handlers):
-    handle = webhook_handlers["meta_webhook_handler"]
+async def test_webhook_handle_invalid_sig(registered_routes):
+    handle = registered_routes["meta_webhook_handler"]
     req = create_request(
         method="POST",
         headers={"X-Hub-Signature-256": "sha256=invalid"},
@@ -124,19 +105,17 @@ async def test_webhook_handle_invalid_sig(webhook_handlers):
     resp = await handle(req)
     assert resp.status_code == 403
 
-@pytest.mark.asyncio
-async def test_webhook_handle_invalid_json(webhook_handlers):
-    handle = webhook_handlers["meta_webhook_handler"]
+async def test_webhook_handle_invalid_json(registered_routes):
+    handle = registered_routes["meta_webhook_handler"]
     
     body = b"not json"
-    secret = b"my_secret"
-    sig = hmac.new(secret, body, hashlib.sha256).hexdigest()
-    
+
     req = create_request(
         method="POST",
-        headers={"X-Hub-Signature-256": f"sha256={sig}"},
+        headers={"X-Hub-Signature-256": f"sha256={_sig(b'my_secret', body)}"},
         body=body
     )
     
     resp = await handle(req)
     assert resp.status_code == 400
+    assert serialization.loads(resp.body) == {"ok": False, "reason": "invalid_json"}
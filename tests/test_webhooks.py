@@ -1,25 +1,38 @@
 from __future__ import annotations
 
+import asyncio
 import hmac
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
+from sqlalchemy import text
 
 from meta_mcp.errors import MCPException
-from meta_mcp.mcp_tools.webhooks import _validate_signature
-from meta_mcp.storage.queue import WebhookEventQueue
+from meta_mcp.mcp_tools.webhooks import _keyed_hmacs, _validate_signature
+from meta_mcp.storage import queue as queue_module
+from meta_mcp.storage.db import read_connection
+from meta_mcp.storage.queue import MAX_DEQUEUE_BATCH, WebhookEventQueue
 
 
 def test_validate_signature() -> None:
     secret = "secret"
+    keyed = _keyed_hmacs(secret)
     body = b"payload"
     digest = hmac.new(secret.encode(), body, "sha256").hexdigest()
     headers = {"X-Hub-Signature-256": f"sha256={digest}"}
-    assert _validate_signature(headers, body, secret)
-    assert not _validate_signature({}, body, secret)
+    assert _validate_signature(headers, body, keyed)
+    # Each check hashes a copy, so the keyed state is reusable.
+    assert _validate_signature(headers, body, keyed)
+    assert not _validate_signature({}, body, keyed)
+    sha1 = hmac.new(secret.encode(), body, "sha1").hexdigest()
+    assert _validate_signature({"X-Hub-Signature": f"sha1={sha1}"}, body, _keyed_hmacs(b"secret"))
+    assert not _validate_signature({"X-Hub-Signature": f"sha1={sha1}"}, b"tampered", keyed)
+    assert not _validate_signature({"X-Hub-Signature": f"md5={sha1}"}, body, keyed)
 
 
-@pytest.mark.asyncio
 async def test_webhook_queue_roundtrip() -> None:
     queue = WebhookEventQueue()
     await queue.record_delivery(
@@ -35,8 +48,100 @@ async def test_webhook_queue_roundtrip() -> None:
     assert "processed_at" in events[0]
 
 
-@pytest.mark.asyncio
 async def test_webhook_queue_invalid_max() -> None:
     queue = WebhookEventQueue()
     with pytest.raises(MCPException):
         await queue.dequeue(maximum=0)
+    with pytest.raises(MCPException):
+        await queue.dequeue(maximum=MAX_DEQUEUE_BATCH + 1)
+
+
+async def test_webhook_queue_group_commits_concurrent_deliveries() -> None:
+    queue = WebhookEventQueue()
+    await asyncio.gather(
+        *(
+            queue.record_delivery(topic="feed", object_id=str(index), payload={"n": index})
+            for index in range(5)
+        )
+    )
+    events = await queue.dequeue(maximum=10)
+    assert sorted(event["object_id"] for event in events) == ["0", "1", "2", "3", "4"]
+    assert queue._pending == []
+
+
+async def test_webhook_queue_cancelled_flush_fails_co_batched_callers(monkeypatch) -> None:
+    gates: list[asyncio.Event] = []
+    second_flush = asyncio.Event()
+
+    @asynccontextmanager
+    async def gated_scope():
+        gate = asyncio.Event()
+        gates.append(gate)
+        if len(gates) == 2:
+            second_flush.set()
+        await gate.wait()
+        yield SimpleNamespace(execute=AsyncMock())
+
+    monkeypatch.setattr(queue_module, "transaction_scope", gated_scope)
+    queue = WebhookEventQueue()
+    first = asyncio.create_task(queue.record_delivery(topic="feed", object_id="0", payload={}))
+    await asyncio.sleep(0)
+    # Both rows land in the next batch while the first flush holds the lock.
+    flusher = asyncio.create_task(queue.record_delivery(topic="feed", object_id="1", payload={}))
+    follower = asyncio.create_task(queue.record_delivery(topic="feed", object_id="2", payload={}))
+    await asyncio.sleep(0)
+    gates[0].set()
+    await first
+    await asyncio.wait_for(second_flush.wait(), timeout=1)
+
+    flusher.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flusher
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(follower, timeout=1)
+    assert len(gates) == 2
+    assert queue._pending == []
+
+
+async def test_webhook_queue_dequeue_claims_oldest_once() -> None:
+    queue = WebhookEventQueue()
+    await queue.dequeue(maximum=MAX_DEQUEUE_BATCH)
+    for day in (3, 1, 2):
+        await queue.record_delivery(
+            topic="feed",
+            object_id=f"day-{day}",
+            payload={},
+            delivered_at=datetime(2024, 1, day, tzinfo=UTC),
+        )
+    first = await queue.dequeue(maximum=2)
+    assert [event["object_id"] for event in first] == ["day-1", "day-2"]
+    second = await queue.dequeue(maximum=2)
+    assert [event["object_id"] for event in second] == ["day-3"]
+    assert await queue.dequeue(maximum=2) == []
+
+
+async def test_webhook_payload_stored_as_packed_bytes() -> None:
+    queue = WebhookEventQueue()
+    await queue.record_delivery(topic="feed", object_id="packed", payload={"nested": {"n": 1}})
+    async with read_connection() as conn:
+        raw = (
+            await conn.execute(
+                text("SELECT payload FROM webhook_events WHERE object_id = 'packed'")
+            )
+        ).scalar_one()
+    assert isinstance(raw, bytes)
+    events = await queue.dequeue(maximum=MAX_DEQUEUE_BATCH)
+    assert {"nested": {"n": 1}} in [event["payload"] for event in events]
+
+
+async def test_unprocessed_scan_uses_partial_index() -> None:
+    async with read_connection() as conn:
+        plan = (
+            await conn.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT id FROM webhook_events "
+                    "WHERE processed_at IS NULL ORDER BY delivered_at LIMIT 50"
+                )
+            )
+        ).all()
+    assert any("ix_webhook_events_unprocessed" in str(row) for row in plan)